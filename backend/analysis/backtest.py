@@ -0,0 +1,78 @@
+'''
+Leave-one-season-out backtesting over the matchups table.
+
+Feature arrays are built once and handed to each worker process when it starts,
+so a fold only slices arrays instead of re-reading or re-building frames.
+'''
+
+import os
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+from backend.analysis.features import matchup_arrays, game_rounds
+from backend.analysis.model import LogisticModel
+
+# Per-game bracket points by round (1 = round of 64 ... 6 = final)
+ROUND_POINTS = np.array([0, 1, 2, 4, 8, 16, 32], dtype=float)
+
+# Worker-process state, set once by _init_worker
+_shared = {}
+
+
+def _init_worker(X, y, years, rounds, model_factory):
+    _shared.update(X=X, y=y, years=years, rounds=rounds, model_factory=model_factory)
+
+
+def score_predictions(p, y, rounds):
+    """Log-loss, accuracy and bracket points for predicted teamA win probabilities."""
+    eps = 1e-15
+    p = np.clip(p, eps, 1 - eps)
+    correct = (p >= 0.5) == (y == 1)
+    return {
+        "games": int(len(y)),
+        "log_loss": float(-np.mean(y * np.log(p) + (1 - y) * np.log(1 - p))),
+        "accuracy": float(correct.mean()),
+        "bracket_points": float(ROUND_POINTS[rounds][correct].sum()),
+        "max_bracket_points": float(ROUND_POINTS[rounds].sum()),
+    }
+
+
+def _run_fold(season):
+    X, y, years = _shared["X"], _shared["y"], _shared["years"]
+    test = years == season
+    model = _shared["model_factory"]().fit(X[~test], y[~test])
+    p = model.predict_proba(X[test])
+    return {"season": int(season), **score_predictions(p, y[test], _shared["rounds"][test])}
+
+
+def prepare(matchups):
+    """Builds the shared (X, y, years, rounds) arrays from Matchup rows or dicts."""
+    X, y, years = matchup_arrays(matchups)
+    get = (lambda m, k: m[k]) if matchups and isinstance(matchups[0], dict) else getattr
+    rounds = game_rounds(years, [get(m, "teamA") for m in matchups], [get(m, "teamB") for m in matchups], y)
+    return X, y, years, rounds
+
+
+def backtest(matchups, model_factory=LogisticModel, workers: int = None):
+    """
+    Trains on every other season and scores each held-out season in a process pool.
+    model_factory must be a picklable callable returning an object with fit(X, y) and predict_proba(X).
+    """
+    X, y, years, rounds = prepare(matchups)
+    seasons = np.unique(years)
+    workers = workers or min(len(seasons), os.cpu_count() or 1)
+
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                             initargs=(X, y, years, rounds, model_factory)) as executor:
+        folds = list(executor.map(_run_fold, seasons))
+
+    # Pool the per-season results, weighting log-loss and accuracy by games played
+    games = np.array([f["games"] for f in folds], dtype=float)
+    summary = {
+        "seasons": len(folds),
+        "games": int(games.sum()),
+        "log_loss": float(np.average([f["log_loss"] for f in folds], weights=games)),
+        "accuracy": float(np.average([f["accuracy"] for f in folds], weights=games)),
+        "bracket_points": float(sum(f["bracket_points"] for f in folds)),
+        "max_bracket_points": float(sum(f["max_bracket_points"] for f in folds)),
+    }
+    return {"summary": summary, "folds": folds}
@@ -0,0 +1,263 @@
+'''
+Advancement probabilities and expected-score bracket optimization.
+
+Teams are indexed by their slot in BRACKET_2025 (0..63). Games are numbered round by round,
+so a bracket is an array of 63 team indices: 32 round-of-64 winners, then 16 round-of-32 winners, etc.
+'''
+
+import asyncio
+import math
+import os
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+
+ROUND_NAMES = ["Round of 64", "Round of 32", "Sweet 16", "Elite 8", "Final Four", "Championship"]
+DEFAULT_SCORING = (1, 2, 4, 8, 16, 32)
+
+# Approximate share of public brackets picking the better seed in each round-of-64 pairing
+# (long-run bracket-challenge averages); calibrates the seed-only public pick model
+PUBLIC_PICK_RATES = {(1, 16): 0.985, (2, 15): 0.94, (3, 14): 0.88, (4, 13): 0.82,
+                     (5, 12): 0.68, (6, 11): 0.64, (7, 10): 0.62, (8, 9): 0.52}
+# Pools larger than this compare against a smoothed estimate rather than a full sampled field
+MAX_OPPONENTS = 1000
+# Opponent-score matrix cells (simulations x opponents) per worker; large pools run fewer simulations
+MAX_CELLS_PER_WORKER = 4_000_000
+# Strengths of the ownership penalty tried for contrarian candidates; beyond ~0.5 the brackets give up
+# too much expected score to win any pool
+CONTRARIAN_EXPONENTS = (0.2, 0.35, 0.5)
+
+# 2025 round of 64 in bracket order. South plays West and East plays Midwest in the Final Four.
+BRACKET_2025 = [
+    ("South", "Auburn", "Alabama State"), ("South", "Louisville", "Creighton"),
+    ("South", "Michigan", "UC San Diego"), ("South", "Texas A&M", "Yale"),
+    ("South", "Ole Miss", "North Carolina"), ("South", "Iowa State", "Lipscomb"),
+    ("South", "Marquette", "New Mexico"), ("South", "Michigan State", "Bryant"),
+    ("West", "Florida", "Norfolk State"), ("West", "UConn", "Oklahoma"),
+    ("West", "Memphis", "Colorado State"), ("West", "Maryland", "Grand Canyon"),
+    ("West", "Missouri", "Drake"), ("West", "Texas Tech", "UNC Wilmington"),
+    ("West", "Kansas", "Arkansas"), ("West", "St. John's", "Omaha"),
+    ("East", "Duke", "Mount St.Mary's"), ("East", "Mississippi State", "Baylor"),
+    ("East", "Oregon", "Liberty"), ("East", "Arizona", "Akron"),
+    ("East", "BYU", "VCU"), ("East", "Wisconsin", "Montana"),
+    ("East", "Saint Mary's", "Vanderbilt"), ("East", "Alabama", "Robert Morris"),
+    ("Midwest", "Houston", "SIU Edwardsville"), ("Midwest", "Gonzaga", "Georgia"),
+    ("Midwest", "Clemson", "McNeese"), ("Midwest", "Purdue", "High Point"),
+    ("Midwest", "Illinois", "Xavier"), ("Midwest", "Kentucky", "Troy"),
+    ("Midwest", "UCLA", "Utah State"), ("Midwest", "Tennessee", "Wofford"),
+]
+
+_executor = None
+_workers = 0
+
+
+def bracket_teams(bracket=BRACKET_2025):
+    """Flattens bracket pairs into the 64 team slots."""
+    return [team for _, teamA, teamB in bracket for team in (teamA, teamB)]
+
+
+def calibrate_public_slope(rates=PUBLIC_PICK_RATES):
+    """Least-squares fit (through the origin) of pick log-odds against the log seed ratio."""
+    x = np.log([worse / better for better, worse in rates])
+    p = np.array(list(rates.values()))
+    y = np.log(p / (1 - p))
+    return float(x @ y / (x @ x))
+
+
+# Seed-only model of how the public fills out brackets (used for contrarian picks)
+PUBLIC_SEED_SLOPE = calibrate_public_slope()
+
+
+def public_proba(seeds, slope: float = PUBLIC_SEED_SLOPE):
+    """
+    Pairwise probabilities implied by seeds alone, a stand-in for public pick rates. Log-odds
+    scale with log(seed ratio), so 1-seeds are picked over 2-seeds far more often than 8s over 9s.
+    """
+    log_seeds = np.log(np.asarray(seeds, dtype=float))
+    return 1.0 / (1.0 + np.exp(-slope * (log_seeds[None, :] - log_seeds[:, None])))
+
+
+def advancement_probabilities(P):
+    """
+    DP over the bracket tree: adv[t, r] is the probability that team t wins its round-r game.
+    Each round, a team's chance is its chance of getting there times its chance of
+    beating whoever comes out of the opposite half of its sub-bracket.
+    """
+    n = P.shape[0]
+    rounds = int(np.log2(n))
+    reach = np.ones(n)
+    adv = np.empty((n, rounds))
+    for r in range(rounds):
+        size = 1 << r
+        new = np.empty(n)
+        for start in range(0, n, 2 * size):
+            a = slice(start, start + size)
+            b = slice(start + size, start + 2 * size)
+            new[a] = reach[a] * (P[a, b] @ reach[b])
+            new[b] = reach[b] * (P[b, a] @ reach[a])
+        reach = new
+        adv[:, r] = reach
+    return adv
+
+
+def pick_weights(ownership, pool_size: int, exponent: float = 0.5):
+    """
+    Contrarian weighting: a correct pick is worth less when the rest of the pool made it too.
+    The expected number of other entries sharing the pick is raised to a power below one, so
+    favourites are discounted rather than written off (exponent 1 picks longshot champions).
+    With pool_size == 1 every weight is 1 and the optimizer maximizes plain expected score.
+    """
+    if pool_size <= 1:
+        return np.ones_like(ownership)
+    return (1.0 + (pool_size - 1) * ownership) ** -exponent
+
+
+def optimal_bracket(adv, scoring=DEFAULT_SCORING, weights=None):
+    """
+    Exact DP for the bracket maximizing sum(points[r] * adv[pick, r] * weights[pick, r]).
+    best[t] holds the best sub-bracket value given t wins that sub-bracket, so each round
+    combines a team's own side with the best pick from the opposite side.
+    """
+    n, rounds = adv.shape
+    gain = adv * np.asarray(scoring[:rounds], dtype=float)
+    if weights is not None:
+        gain = gain * weights
+
+    levels = [np.zeros(n)]
+    for r in range(rounds):
+        size = 1 << r
+        best = levels[-1]
+        new = np.empty(n)
+        for start in range(0, n, 2 * size):
+            a = slice(start, start + size)
+            b = slice(start + size, start + 2 * size)
+            new[a] = best[a] + best[b].max() + gain[a, r]
+            new[b] = best[b] + best[a].max() + gain[b, r]
+        levels.append(new)
+
+    # Walk back down from the champion, taking the best team from each opposite side
+    picks = [np.empty(n >> (r + 1), dtype=int) for r in range(rounds)]
+    stack = [(int(np.argmax(levels[-1])), rounds - 1)]
+    while stack:
+        team, r = stack.pop()
+        picks[r][team >> (r + 1)] = team
+        if r == 0:
+            continue
+        other = ((team >> r) ^ 1) << r
+        rival = other + int(np.argmax(levels[r][other:other + (1 << r)]))
+        picks[r - 1][rival >> r] = rival
+        stack.append((team, r - 1))
+        stack.append((rival, r - 1))
+
+    return np.concatenate(picks)
+
+
+def expected_score(picks, adv, scoring=DEFAULT_SCORING):
+    """Expected pool score of a bracket given advancement probabilities."""
+    total, offset = 0.0, 0
+    for r in range(adv.shape[1]):
+        games = adv.shape[0] >> (r + 1)
+        total += scoring[r] * adv[picks[offset:offset + games], r].sum()
+        offset += games
+    return float(total)
+
+
+def simulate_tournaments(P, n_sims: int, rng):
+    """Samples full tournaments; returns an (n_sims, 63) array of game winners."""
+    n = P.shape[0]
+    alive = np.broadcast_to(np.arange(n), (n_sims, n))
+    winners = []
+    while alive.shape[1] > 1:
+        a, b = alive[:, 0::2], alive[:, 1::2]
+        alive = np.where(rng.random(a.shape) < P[a, b], a, b)
+        winners.append(alive)
+    return np.concatenate(winners, axis=1)
+
+
+def _game_points(n: int, scoring):
+    return np.concatenate([np.full(n >> (r + 1), scoring[r], dtype=float) for r in range(int(np.log2(n)))])
+
+
+_lgamma = np.vectorize(math.lgamma, otypes=[float])
+
+
+def beat_all_probability(wins, n: int, m: int):
+    """
+    Estimates F ** m, the chance of outscoring m public entries, from outscoring `wins` of n
+    sampled ones. With m <= n this is C(wins, m) / C(n, m), the unbiased chance that a random
+    m of the n were all beaten. Larger pools cannot be resolved by the sample, so the posterior
+    mean of F ** m under F ~ Beta(wins + 1, n - wins + 1) is used; unlike the plug-in
+    (wins / n) ** m it stays below 1 when every sampled opponent was beaten.
+    """
+    wins = np.asarray(wins, dtype=float)
+    if m == 0:
+        return np.ones_like(wins)
+    if m <= n:
+        beaten = wins >= m
+        safe = np.where(beaten, wins, m)
+        log_p = _lgamma(safe + 1) - _lgamma(safe - m + 1) + math.lgamma(n - m + 1) - math.lgamma(n + 1)
+        return np.where(beaten, np.exp(log_p), 0.0)
+    log_p = _lgamma(wins + 1 + m) - _lgamma(wins + 1) + math.lgamma(n + 2) - math.lgamma(n + 2 + m)
+    return np.exp(log_p)
+
+
+def _pool_win_chunk(P, P_public, candidates, scoring, pool_size, n_sims, n_opponents, seed):
+    """
+    Monte Carlo worker. Opponents are brackets sampled from the public model; per simulation,
+    a candidate's chance of beating all pool_size - 1 entries is estimated from how many
+    sampled opponents it outscored (ties count half) with beat_all_probability.
+    """
+    rng = np.random.default_rng(seed)
+    points = _game_points(P.shape[0], scoring)
+    outcomes = simulate_tournaments(P, n_sims, rng)
+    opponents = simulate_tournaments(P_public, n_opponents, rng)
+
+    opponent_scores = np.zeros((n_sims, n_opponents))
+    for g in range(outcomes.shape[1]):
+        opponent_scores += (outcomes[:, g][:, None] == opponents[:, g][None, :]) * points[g]
+
+    totals = np.zeros(len(candidates))
+    for i, picks in enumerate(candidates):
+        score = ((outcomes == picks[None, :]) * points).sum(axis=1)
+        wins = (opponent_scores < score[:, None]).sum(axis=1) + 0.5 * (opponent_scores == score[:, None]).sum(axis=1)
+        totals[i] = beat_all_probability(wins, n_opponents, pool_size - 1).sum()
+    return totals
+
+
+def start_executor(max_workers: int = None):
+    """Creates the worker pool for pool simulations; called from the app lifespan."""
+    global _executor, _workers
+    if _executor is None:
+        _workers = max_workers or os.cpu_count() or 1
+        _executor = ProcessPoolExecutor(max_workers=_workers)
+    return _executor
+
+
+def shutdown_executor():
+    """Stops the worker processes, dropping simulations that have not started."""
+    global _executor, _workers
+    if _executor is not None:
+        _executor.shutdown(wait=True, cancel_futures=True)
+        _executor = None
+        _workers = 0
+
+
+async def pool_win_probabilities(P, P_public, candidates, scoring=DEFAULT_SCORING, pool_size: int = 100,
+                                 n_sims: int = 20000, n_opponents: int = 200, seed: int = 0):
+    """
+    Estimates each candidate bracket's chance of winning the pool, split across worker processes.
+    At least pool_size - 1 opponents are sampled (up to MAX_OPPONENTS) so the estimate is unbiased;
+    each worker runs at most MAX_CELLS_PER_WORKER / n_opponents simulations, so large pools trade
+    simulations for opponents and the wall time stays bounded on few cores.
+    """
+    if _executor is None:
+        raise RuntimeError("bracket executor not started; call start_executor() first")
+    n_opponents = max(n_opponents, min(pool_size - 1, MAX_OPPONENTS))
+    workers = _workers
+    per_worker = min(-(-n_sims // workers), max(1, MAX_CELLS_PER_WORKER // n_opponents))
+    loop = asyncio.get_running_loop()
+    chunks = await asyncio.gather(*[
+        loop.run_in_executor(_executor, _pool_win_chunk, P, P_public, candidates, tuple(scoring),
+                             pool_size, per_worker, n_opponents, seed + i)
+        for i in range(workers)
+    ])
+    return np.sum(chunks, axis=0) / (per_worker * workers)
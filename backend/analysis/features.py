@@ -0,0 +1,94 @@
+'''
+Shared feature definitions for models built on the matchups table
+'''
+
+import csv
+import re
+import unicodedata
+from functools import lru_cache
+from pathlib import Path
+import numpy as np
+
+# Curated team name -> Sports-Reference slug, maintained by the data collection scripts
+TEAM_SLUGS_CSV = Path(__file__).resolve().parents[2] / "data collection" / "data" / "mapped_ncaa_teams.csv"
+
+# Team stats that have a diff_* column in the matchups table, in table order
+STAT_COLUMNS = [
+    "seed", "win_pct", "ps_per_game", "pa_per_game", "srs", "sos",
+    "fg_per_game", "fga_per_game", "fg_pct", "fg2_per_game", "fg2a_per_game", "fg2_pct",
+    "fg3_per_game", "fg3a_per_game", "fg3_pct", "ft_per_game", "fta_per_game", "ft_pct",
+    "orb_per_game", "drb_per_game", "trb_per_game", "ast_per_game", "stl_per_game",
+    "blk_per_game", "tov_per_game", "pf_per_game", "offensive_rating", "defensive_rating",
+]
+DIFF_COLUMNS = [f"diff_{col}" for col in STAT_COLUMNS]
+
+
+def team_key(name):
+    """Normalizes a team_stats name to the cleaned form stored in the matchups table."""
+    if not name:
+        return ""
+    name = name.lower().strip()
+    name = re.sub(r"\s*\(.*?\)", "", name)  # Remove text inside parentheses
+    name = re.sub(r"[^\w\s-]", "", name)  # Remove special characters except hyphens
+    name = name.replace("st ", "saint ")  # Standardize abbreviations
+    return name
+
+
+@lru_cache(maxsize=1)
+def team_slugs():
+    """Lower-cased curated team name -> Sports-Reference slug."""
+    with open(TEAM_SLUGS_CSV, newline="") as f:
+        return {row["unique_ncaa_team"].strip().lower(): row["lower_ncaa_team"] for row in csv.DictReader(f)}
+
+
+def team_slug(name):
+    """
+    Canonical identity of a program across seasons and spellings: its Sports-Reference slug
+    (UConn and Connecticut are both connecticut; Miami (FL) and Miami (OH) stay apart).
+    Names missing from the curated mapping are slugified, so slugs themselves map to themselves.
+    """
+    if not name:
+        return ""
+    slug = team_slugs().get(name.strip().lower())
+    if slug:
+        return slug
+    name = unicodedata.normalize("NFKD", name).encode("ascii", "ignore").decode().lower()
+    name = re.sub(r"['’]", "", name.replace("&", "and"))
+    return re.sub(r"[^a-z0-9]+", "-", name).strip("-")
+
+
+def _value(row, key):
+    value = row.get(key) if isinstance(row, dict) else getattr(row, key, None)
+    return np.nan if value is None else value
+
+
+def matchup_arrays(matchups):
+    """Builds (X, y, years) arrays from Matchup rows or dicts; missing diffs become 0."""
+    X = np.array([[_value(m, col) for col in DIFF_COLUMNS] for m in matchups], dtype=float).reshape(-1, len(DIFF_COLUMNS))
+    X = np.nan_to_num(X, nan=0.0)
+    y = np.array([_value(m, "winner") for m in matchups], dtype=float)
+    years = np.array([_value(m, "year") for m in matchups], dtype=int)
+    return X, y, years
+
+
+def team_stat_matrix(teams):
+    """Builds a (teams x STAT_COLUMNS) matrix from TeamStats rows, imputing gaps with the field mean."""
+    S = np.array([[_value(t, col) for col in STAT_COLUMNS] for t in teams], dtype=float).reshape(-1, len(STAT_COLUMNS))
+    means = np.nanmean(np.where(np.isnan(S).all(axis=0), 0.0, S), axis=0)
+    return np.where(np.isnan(S), means, S)
+
+
+def game_rounds(years, teamA, teamB, winner):
+    """
+    Infers the round (1 = round of 64 ... 6 = final) of each tournament game.
+    A game is the loser's (tournament wins + 1)-th game, so counting each team's wins per year is enough.
+    """
+    wins = {}
+    for year, a, b, w in zip(years, teamA, teamB, winner):
+        victor = a if w == 1 else b
+        wins[(year, victor)] = wins.get((year, victor), 0) + 1
+    rounds = np.empty(len(years), dtype=int)
+    for i, (year, a, b, w) in enumerate(zip(years, teamA, teamB, winner)):
+        loser = b if w == 1 else a
+        rounds[i] = min(wins.get((year, loser), 0) + 1, 6)
+    return rounds
@@ -0,0 +1,59 @@
+'''
+Logistic win-probability model fit on the matchups diff_* features
+'''
+
+import numpy as np
+
+
+def _sigmoid(z):
+    return 1.0 / (1.0 + np.exp(-np.clip(z, -30, 30)))
+
+
+class LogisticModel:
+    """
+    L2-regularized logistic regression with no intercept.
+    Every game is also added reversed (-diffs, 1 - winner), so P(A beats B) + P(B beats A) == 1.
+    """
+
+    def __init__(self, l2: float = 1.0, iterations: int = 25):
+        self.l2 = l2
+        self.iterations = iterations
+        self.scale = None
+        self.coef = None
+
+    def fit(self, X, y):
+        X = np.vstack([X, -X])
+        y = np.concatenate([y, 1.0 - y])
+
+        # Diffs are symmetric around 0, so scale without centering to keep the model antisymmetric
+        self.scale = X.std(axis=0)
+        self.scale[self.scale == 0] = 1.0
+        Z = X / self.scale
+
+        # Newton-Raphson (IRLS); converges in a handful of steps on ~4k rows
+        w = np.zeros(Z.shape[1])
+        penalty = self.l2 * np.eye(Z.shape[1])
+        for _ in range(self.iterations):
+            p = _sigmoid(Z @ w)
+            gradient = Z.T @ (p - y) + self.l2 * w
+            hessian = (Z * (p * (1 - p))[:, None]).T @ Z + penalty
+            step = np.linalg.solve(hessian, gradient)
+            w -= step
+            if np.abs(step).max() < 1e-8:
+                break
+
+        self.coef = w
+        return self
+
+    def predict_proba(self, X):
+        """Probability that teamA wins for each row of diffs."""
+        return _sigmoid((X / self.scale) @ self.coef)
+
+    def strengths(self, stats):
+        """Per-team linear scores; P(i beats j) = sigmoid(strength_i - strength_j)."""
+        return (stats / self.scale) @ self.coef
+
+    def pairwise_proba(self, stats):
+        """Matrix P where P[i, j] is the probability that team i beats team j."""
+        s = self.strengths(stats)
+        return _sigmoid(s[:, None] - s[None, :])
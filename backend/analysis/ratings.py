@@ -0,0 +1,79 @@
+'''
+Elo ratings replayed over historical tournament games.
+
+Ratings are checkpointed at the end of every season, so adding a season's results
+only needs the previous checkpoint and that season's games.
+'''
+
+from backend.analysis.features import game_rounds, team_slug
+
+INITIAL_RATING = 1500.0
+K_FACTOR = 32.0
+SEASON_CARRYOVER = 0.75  # Share of a team's distance from the mean kept between seasons
+
+
+def expected_score(rating_a: float, rating_b: float):
+    """Elo probability that team A beats team B."""
+    return 1.0 / (1.0 + 10 ** ((rating_b - rating_a) / 400.0))
+
+
+def games_by_year(matchups, slugs=None):
+    """
+    Groups Matchup rows or dicts into {year: [(teamA, teamB, winner), ...]} in round order.
+    Teams are their team_slug(): looked up through teamA_id/teamB_id in slugs
+    ({team_stats.id: slug}) when set, else derived from the stored name.
+    """
+    get = (lambda m, k: m.get(k)) if matchups and isinstance(matchups[0], dict) else (lambda m, k: getattr(m, k, None))
+    slugs = slugs or {}
+    team = lambda m, side: slugs.get(get(m, f"{side}_id")) or team_slug(get(m, side))
+    years = [int(get(m, "year")) for m in matchups]
+    teamA = [team(m, "teamA") for m in matchups]
+    teamB = [team(m, "teamB") for m in matchups]
+    winner = [int(get(m, "winner")) for m in matchups]
+    rounds = game_rounds(years, teamA, teamB, winner)
+
+    grouped = {}
+    for _, year, a, b, w in sorted(zip(rounds, years, teamA, teamB, winner), key=lambda g: (g[1], g[0])):
+        grouped.setdefault(year, []).append((a, b, w))
+    return grouped
+
+
+def replay_season(previous, games):
+    """
+    Plays one season on top of the previous checkpoint ({team: rating}).
+    Returns the new checkpoint as {team: {"pre_rating", "rating", "games"}}.
+    """
+    pre = {team: INITIAL_RATING + SEASON_CARRYOVER * (rating - INITIAL_RATING) for team, rating in previous.items()}
+    for a, b, _ in games:
+        pre.setdefault(a, INITIAL_RATING)
+        pre.setdefault(b, INITIAL_RATING)
+
+    ratings = dict(pre)
+    played = dict.fromkeys(pre, 0)
+    for a, b, winner in games:
+        delta = K_FACTOR * ((1.0 if winner == 1 else 0.0) - expected_score(ratings[a], ratings[b]))
+        ratings[a] += delta
+        ratings[b] -= delta
+        played[a] += 1
+        played[b] += 1
+
+    return {team: {"pre_rating": pre[team], "rating": ratings[team], "games": played[team]} for team in ratings}
+
+
+def replay(grouped, through_year: int = None, checkpoint=None, start_year: int = None):
+    """
+    Replays seasons in order and returns {year: checkpoint}.
+    Pass checkpoint ({team: rating}) and start_year to continue from a stored season instead of from scratch.
+    """
+    if not grouped and start_year is None:
+        return {}
+    first = start_year if start_year is not None else min(grouped)
+    last = max([through_year or first, *grouped])
+    ratings = dict(checkpoint or {})
+
+    checkpoints = {}
+    for year in range(first, last + 1):
+        season = replay_season(ratings, grouped.get(year, []))
+        ratings = {team: values["rating"] for team, values in season.items()}
+        checkpoints[year] = season
+    return checkpoints
@@ -0,0 +1,105 @@
+'''
+Server-side feature transforms for matchup rows.
+
+Applied in a fixed order: orient -> augment -> zscore.
+    orient   flips games so teamA is the better (lower-numbered) seed
+    augment  adds each game reversed (teams swapped, diffs negated, winner flipped)
+    zscore   standardizes every diff_* column by that season's mean and standard deviation
+'''
+
+import numpy as np
+from backend.analysis.features import DIFF_COLUMNS
+
+TRANSFORMS = ("orient", "augment", "zscore")
+
+# (data version, year, orient, augment) -> (mean, std) for finished seasons
+_moments = {}
+
+
+def parse_transforms(value: str):
+    """Parses 'zscore,orient' into a validated set; raises ValueError on unknown names."""
+    if not value:
+        return set()
+    names = {name.strip() for name in value.split(",") if name.strip()}
+    unknown = names - set(TRANSFORMS)
+    if unknown:
+        raise ValueError(f"unknown transform(s): {', '.join(sorted(unknown))}; expected {', '.join(TRANSFORMS)}")
+    return names
+
+
+def _nan(value):
+    return np.nan if value is None else value
+
+
+def compute_moments(X):
+    """Column means and standard deviations ignoring NaN; all-NaN or constant columns get (0, 1)."""
+    with np.errstate(invalid="ignore"):
+        mean = np.nanmean(np.where(np.isnan(X).all(axis=0), 0.0, X), axis=0)
+        std = np.nanstd(np.where(np.isnan(X).all(axis=0), 1.0, X), axis=0)
+    std[~(std > 0)] = 1.0
+    return mean, std
+
+
+def clear_moments():
+    """Drops cached moments; registered as an invalidation hook for team_stats writes."""
+    _moments.clear()
+
+
+def season_moments(year: int, X, oriented: bool, augmented: bool, frozen: bool, version: int = 0):
+    """Per-season moments; a frozen (finished) season's are computed once per data version and then served by year."""
+    if not frozen:
+        return compute_moments(X)
+    key = (version, year, oriented, augmented)
+    if key not in _moments:
+        _moments[key] = compute_moments(X)
+    return _moments[key]
+
+
+def apply_transforms(matchups, transforms, frozen_before: int = None, version: int = 0):
+    """
+    Vectorized transforms over matchup dicts (as returned by MatchupHandler.get_matchups).
+    Every season in matchups must be complete; seasons before frozen_before only change with
+    the data version the rows were read at, so their z-score moments are cached per version and year.
+    """
+    if not matchups or not transforms:
+        return matchups
+
+    X = np.array([[_nan(m.get(col)) for col in DIFF_COLUMNS] for m in matchups], dtype=float)
+    years = np.array([m["year"] for m in matchups])
+    ids = [m.get("id") for m in matchups]
+    teamA = np.array([m["teamA"] for m in matchups], dtype=object)
+    teamB = np.array([m["teamB"] for m in matchups], dtype=object)
+    winner = np.array([m["winner"] for m in matchups])
+    mirrored = np.zeros(len(matchups), dtype=bool)
+
+    if "orient" in transforms:
+        # diff_seed > 0 means teamA has the worse seed number
+        flip = X[:, DIFF_COLUMNS.index("diff_seed")] > 0
+        X[flip] = -X[flip]
+        teamA, teamB = np.where(flip, teamB, teamA), np.where(flip, teamA, teamB)
+        winner = np.where(flip, 1 - winner, winner)
+
+    if "augment" in transforms:
+        X = np.vstack([X, -X])
+        years = np.concatenate([years, years])
+        ids = ids + ids
+        teamA, teamB = np.concatenate([teamA, teamB]), np.concatenate([teamB, teamA])
+        winner = np.concatenate([winner, 1 - winner])
+        mirrored = np.concatenate([mirrored, ~mirrored])
+
+    if "zscore" in transforms:
+        for year in np.unique(years):
+            rows = years == year
+            frozen = frozen_before is not None and year < frozen_before
+            mean, std = season_moments(int(year), X[rows], "orient" in transforms, "augment" in transforms, frozen, version)
+            X[rows] = (X[rows] - mean) / std
+
+    X = np.round(X, 4)
+    transformed = []
+    for i in range(len(X)):
+        row = {"id": ids[i], "year": int(years[i]), "teamA": teamA[i], "teamB": teamB[i], "winner": int(winner[i])}
+        if "augment" in transforms:
+            row["mirrored"] = bool(mirrored[i])
+        row.update({col: (None if np.isnan(v) else float(v)) for col, v in zip(DIFF_COLUMNS, X[i])})
+        transformed.append(row)
+    return transformed
@@ -0,0 +1,211 @@
+import asyncio
+import ipaddress
+import math
+import os
+import time
+from collections import OrderedDict
+
+# Path prefixes served from process memory; everything else (including /bracket/, which reads
+# the field from the DB and runs simulations) is assumed to need a DB connection
+MEMORY_ROUTES = ("/teams/",)
+# Never queued or rate limited: probes, metrics and long-lived event streams
+EXEMPT_ROUTES = {"/", "/ready", "/metrics", "/live/stream"}
+MAX_CLIENTS = 10000
+
+class TokenBucket:
+    """Refills rate tokens per second up to burst; each request takes one."""
+
+    def __init__(self, rate: float, burst: float):
+        self.rate = rate
+        self.burst = burst
+        self.tokens = burst
+        self.updated = time.monotonic()
+
+    def take(self):
+        """Takes a token and returns 0, or returns the seconds until one is available."""
+        now = time.monotonic()
+        self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+        if self.tokens >= 1:
+            self.tokens -= 1
+            return 0.0
+        return (1 - self.tokens) / self.rate
+
+class RouteClass:
+    """
+    At most capacity requests run at once; up to queue_size more wait (for at most max_wait
+    seconds) and anything beyond that is shed immediately.
+    """
+
+    def __init__(self, name: str, capacity: int, queue_size: int, max_wait: float):
+        self.name = name
+        self.configure(capacity, queue_size, max_wait)
+        self.active = 0
+        self.waiting = 0
+        self.service_time = 0.05  # EWMA of seconds per request, for Retry-After
+        self.counters = {"admitted": 0, "queued": 0, "shed": 0, "timeouts": 0}
+
+    def configure(self, capacity: int, queue_size: int, max_wait: float):
+        self.capacity = capacity
+        self.queue_size = queue_size
+        self.max_wait = max_wait
+        self.semaphore = asyncio.Semaphore(capacity)
+
+    async def acquire(self):
+        """True once a slot is held; False if the request was shed."""
+        if self.semaphore.locked():
+            if self.waiting >= self.queue_size:
+                self.counters["shed"] += 1
+                return False
+            self.counters["queued"] += 1
+            self.waiting += 1
+            try:
+                await asyncio.wait_for(self.semaphore.acquire(), self.max_wait)
+            except asyncio.TimeoutError:
+                self.counters["timeouts"] += 1
+                return False
+            finally:
+                self.waiting -= 1
+        else:
+            await self.semaphore.acquire()
+        self.active += 1
+        self.counters["admitted"] += 1
+        return True
+
+    def release(self, elapsed: float):
+        self.active -= 1
+        self.semaphore.release()
+        self.service_time = 0.9 * self.service_time + 0.1 * elapsed
+
+    def retry_after(self):
+        """Seconds until the current queue should have drained."""
+        return self.service_time * (self.waiting + 1) / self.capacity
+
+    def stats(self):
+        return {"active": self.active, "waiting": self.waiting, "capacity": self.capacity,
+                "queue_size": self.queue_size, "service_ms": round(self.service_time * 1000, 2), **self.counters}
+
+class AdmissionControl:
+    """
+    Sits in front of the routers: a per-client token bucket, then a bounded queue per route
+    class, so bursts get a fast 429 with Retry-After instead of piling up on the DB pool.
+    """
+
+    def __init__(self):
+        self.classes = {}
+        self.buckets = OrderedDict()  # client -> TokenBucket, least recently seen first
+        self.counters = {"rate_limited": 0}
+        self.configure()
+
+    def configure(self):
+        """(Re)reads limits from the environment; called again at startup once .env is loaded."""
+        self.enabled = os.getenv("ADMISSION_ENABLED", "true").strip().lower() in ("1", "true", "yes")
+        self.rate = float(os.getenv("ADMISSION_RATE", "20"))  # Per client, requests per second; 0 disables
+        self.burst = float(os.getenv("ADMISSION_BURST", "40"))
+        # Only configured keys identify a client; any other X-API-Key is ignored, so minting keys gains nothing
+        self.api_keys = {key.strip() for key in os.getenv("ADMISSION_API_KEYS", "").split(",") if key.strip()}
+        # Peers whose X-Forwarded-For is believed (load balancers, reverse proxies): addresses or CIDRs
+        self.trusted_proxies = [ipaddress.ip_network(net.strip(), strict=False)
+                                for net in os.getenv("ADMISSION_TRUSTED_PROXIES", "").split(",") if net.strip()]
+        max_wait = float(os.getenv("ADMISSION_MAX_WAIT", "2.0"))
+        # DB-bound requests beyond the pool's connections would only wait inside SQLAlchemy
+        db_capacity = int(os.getenv("ADMISSION_DB_CONCURRENCY", int(os.getenv("DB_POOL_SIZE", "5")) + int(os.getenv("DB_MAX_OVERFLOW", "10"))))
+        limits = {
+            "db": (db_capacity, int(os.getenv("ADMISSION_DB_QUEUE", db_capacity * 4))),
+            "memory": (int(os.getenv("ADMISSION_MEMORY_CONCURRENCY", "64")), int(os.getenv("ADMISSION_MEMORY_QUEUE", "256"))),
+        }
+        for name, (capacity, queue_size) in limits.items():
+            if name in self.classes:
+                self.classes[name].configure(capacity, queue_size, max_wait)
+            else:
+                self.classes[name] = RouteClass(name, capacity, queue_size, max_wait)
+        self.buckets.clear()
+
+    def route_class(self, path: str):
+        if path in EXEMPT_ROUTES:
+            return None
+        return self.classes["memory" if path.startswith(MEMORY_ROUTES) else "db"]
+
+    def trusted(self, address: str):
+        try:
+            ip = ipaddress.ip_address(address)
+        except ValueError:
+            return False
+        return any(ip in net for net in self.trusted_proxies)
+
+    def client_id(self, scope):
+        """
+        Clients are told apart by API key when they send a configured one, else by address.
+        Behind trusted proxies the address is the right-most X-Forwarded-For hop that is not
+        itself a trusted proxy; without any configured, forwarded headers are ignored.
+        """
+        headers = dict(scope.get("headers", ()))
+        key = headers.get(b"x-api-key", b"").decode("latin-1")
+        if key and key in self.api_keys:
+            return "key:" + key
+        client = scope.get("client")
+        address = client[0] if client else "unknown"
+        if self.trusted_proxies and self.trusted(address):
+            hops = [hop.strip() for hop in headers.get(b"x-forwarded-for", b"").decode("latin-1").split(",") if hop.strip()]
+            for hop in reversed(hops):
+                address = hop
+                if not self.trusted(hop):
+                    break
+        return address
+
+    def bucket(self, client: str):
+        bucket = self.buckets.get(client)
+        if bucket is None:
+            bucket = self.buckets[client] = TokenBucket(self.rate, self.burst)
+            if len(self.buckets) > MAX_CLIENTS:
+                self.buckets.popitem(last=False)
+        else:
+            self.buckets.move_to_end(client)
+        return bucket
+
+    def stats(self):
+        return {
+            "enabled": self.enabled,
+            "clients": len(self.buckets),
+            **self.counters,
+            "classes": {name: route_class.stats() for name, route_class in self.classes.items()},
+        }
+
+# Shared by the middleware and /metrics
+admission = AdmissionControl()
+
+async def reject(send, retry_after: float, detail: str):
+    body = ('{"detail":"%s"}' % detail).encode()
+    await send({"type": "http.response.start", "status": 429, "headers": [
+        (b"content-type", b"application/json"),
+        (b"content-length", str(len(body)).encode()),
+        (b"retry-after", str(max(1, math.ceil(retry_after))).encode()),
+    ]})
+    await send({"type": "http.response.body", "body": body})
+
+class AdmissionMiddleware:
+    """Pure ASGI middleware (no response buffering, so streaming routes are unaffected)."""
+
+    def __init__(self, app, control: AdmissionControl = admission):
+        self.app = app
+        self.control = control
+
+    async def __call__(self, scope, receive, send):
+        control = self.control
+        route_class = control.route_class(scope["path"]) if scope["type"] == "http" and control.enabled else None
+        if route_class is None:
+            return await self.app(scope, receive, send)
+
+        if control.rate > 0:
+            wait = control.bucket(control.client_id(scope)).take()
+            if wait > 0:
+                control.counters["rate_limited"] += 1
+                return await reject(send, wait, "rate limit exceeded")
+
+        if not await route_class.acquire():
+            return await reject(send, route_class.retry_after(), f"{route_class.name} queue full")
+        start = time.perf_counter()
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            route_class.release(time.perf_counter() - start)
@@ -0,0 +1,50 @@
+import asyncio
+import itertools
+import json
+from collections import deque
+
+class Broadcaster:
+    """
+    In-process fan-out for server-sent events. Every subscriber gets its own bounded queue;
+    a subscriber that falls too far behind is dropped instead of slowing everyone else down.
+    Recent events are kept so reconnecting clients can resume from Last-Event-ID.
+    """
+
+    def __init__(self, queue_size: int = 100, history: int = 256):
+        self.queue_size = queue_size
+        self.subscribers = set()
+        self.history = deque(maxlen=history)
+        self.ids = itertools.count(1)
+
+    def subscribe(self, last_event_id: int = None):
+        queue = asyncio.Queue(maxsize=self.queue_size)
+        if last_event_id is not None:
+            for event in self.history:
+                if event[0] > last_event_id and not queue.full():
+                    queue.put_nowait(event)
+        self.subscribers.add(queue)
+        return queue
+
+    def unsubscribe(self, queue):
+        self.subscribers.discard(queue)
+
+    def publish(self, event: str, data):
+        """Queues an event for every subscriber; returns the event id."""
+        message = (next(self.ids), event, json.dumps(data, default=str))
+        self.history.append(message)
+        for queue in list(self.subscribers):
+            try:
+                queue.put_nowait(message)
+            except asyncio.QueueFull:
+                # The stream drains what it has, notices it was dropped and closes; the client resumes by id
+                self.unsubscribe(queue)
+        return message[0]
+
+    @staticmethod
+    def format(message):
+        """Encodes a queued message as an SSE frame."""
+        event_id, event, data = message
+        return f"id: {event_id}\nevent: {event}\ndata: {data}\n\n"
+
+# Single broadcaster shared by every request in this process
+broadcaster = Broadcaster()
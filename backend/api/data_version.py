@@ -0,0 +1,56 @@
+import asyncio
+import logging
+import os
+from sqlalchemy.future import select
+from backend.db_conn import SessionFactory
+from backend.models.data_version import DataVersion
+
+logger = logging.getLogger(__name__)
+
+class DataVersionWatcher:
+    """
+    Tracks the team_stats version in data_versions and, when it moves, runs every registered
+    invalidation hook. generation counts the changes seen by this process; caches put it in
+    their keys so a body built from old data can never be served after a change, even if its
+    load was still in flight when the hooks ran.
+    """
+
+    def __init__(self, table: str = "team_stats"):
+        self.table = table
+        self.version = None
+        self.generation = 0
+        self.hooks = []
+
+    def on_change(self, hook):
+        """Registers a callable run (without arguments) whenever the data changes."""
+        self.hooks.append(hook)
+        return hook
+
+    def invalidate(self):
+        """Drops everything built from the old data; also the hook for in-process writers."""
+        self.generation += 1
+        for hook in self.hooks:
+            hook()
+
+    async def refresh(self, db):
+        """Reads the stored version; the first read only records it."""
+        version = await db.scalar(select(DataVersion.version).where(DataVersion.name == self.table))
+        if version is None:
+            return
+        if self.version is not None and version != self.version:
+            logger.info("%s changed (version %s -> %s); dropping cached data", self.table, self.version, version)
+            self.invalidate()
+        self.version = version
+
+    async def watch(self, interval: float = None):
+        """Polls the version until cancelled; run from the app lifespan."""
+        interval = interval if interval is not None else float(os.getenv("DATA_VERSION_POLL_SECONDS", "5"))
+        while True:
+            try:
+                async with SessionFactory() as session:
+                    await self.refresh(session)
+            except Exception as e:
+                logger.warning("data version check failed: %s", e)
+            await asyncio.sleep(interval)
+
+data_version = DataVersionWatcher()
@@ -0,0 +1,151 @@
+import gzip
+import json
+from collections import OrderedDict
+from fastapi import HTTPException, Request, Response
+from backend.api.data_version import data_version
+
+# Optional encoders; formats and encodings whose package is missing are simply not offered
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+try:
+    import brotli
+except ImportError:
+    brotli = None
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+LIVE_YEAR = 2025  # Earlier seasons only change through corrections, so their encoded bodies can be cached
+MIN_COMPRESS_BYTES = 1024
+CACHE_ENTRIES = 256
+# Short enough that clients and proxies pick up a team_stats correction within minutes
+CACHE_MAX_AGE = 300
+
+FORMATS = ("records", "split", "msgpack")
+MEDIA_TYPES = {"records": "application/json", "split": "application/json", "msgpack": "application/msgpack"}
+
+COMPRESSORS = {"gzip": lambda body: gzip.compress(body, compresslevel=6)}
+if brotli is not None:
+    COMPRESSORS["br"] = lambda body: brotli.compress(body, quality=5)
+if zstandard is not None:
+    COMPRESSORS["zstd"] = lambda body: zstandard.ZstdCompressor(level=10).compress(body)
+PREFERENCE = ("zstd", "br", "gzip")
+
+# (data generation, cache_key, format, encoding) -> encoded body, least recently used first
+_cache = OrderedDict()
+data_version.on_change(_cache.clear)
+
+
+def immutable_years(start_year: int = None, end_year: int = None):
+    """True when a query only covers finished seasons."""
+    return start_year is not None and end_year is not None and end_year < LIVE_YEAR
+
+
+def negotiate_format(request: Request, format: str = None):
+    """Picks the body layout from ?format= or, failing that, the Accept header."""
+    if format is None:
+        accept = request.headers.get("accept", "")
+        format = "msgpack" if "msgpack" in accept else "records"
+    if format not in FORMATS:
+        raise HTTPException(status_code=400, detail=f"format must be one of {', '.join(FORMATS)}")
+    if format == "msgpack" and msgpack is None:
+        raise HTTPException(status_code=406, detail="msgpack encoding is not available")
+    return format
+
+
+def negotiate_encoding(request: Request):
+    """Picks the best supported Content-Encoding from Accept-Encoding (q=0 entries excluded)."""
+    accepted = {}
+    for part in request.headers.get("accept-encoding", "").split(","):
+        name, _, params = part.strip().partition(";")
+        q = 1.0
+        if params.strip().startswith("q="):
+            try:
+                q = float(params.strip()[2:])
+            except ValueError:
+                q = 0.0
+        if name:
+            accepted[name.lower()] = q
+    for name in PREFERENCE:
+        if name in COMPRESSORS and accepted.get(name, accepted.get("*", 0)) > 0:
+            return name
+    return None
+
+
+def to_split(rows):
+    """Column-oriented layout: column names once, then one array of values per row."""
+    columns = list(rows[0].keys()) if rows else []
+    return {"columns": columns, "data": [[row.get(col) for col in columns] for row in rows]}
+
+
+def to_columns(rows):
+    """Column-major layout: column names once, then one array of values per column."""
+    columns = list(rows[0].keys()) if rows else []
+    return {"columns": columns, "data": [[row.get(col) for row in rows] for col in columns]}
+
+
+def encode_body(key: str, rows, format: str, extra=None):
+    if format == "msgpack":
+        # Column arrays with 32-bit floats: values are already rounded to a few decimals, and a
+        # float64 costs msgpack 9 bytes where JSON spends ~5 characters
+        payload = {**(extra or {}), key: to_columns(rows)}
+        return msgpack.packb(payload, use_bin_type=True, use_single_float=True)
+    payload = {**(extra or {}), key: to_split(rows) if format == "split" else rows}
+    return json.dumps(payload, separators=(",", ":"), default=str).encode()
+
+
+def compress(body: bytes, encoding: str):
+    """Returns (body, encoding actually applied); small bodies are sent as they are."""
+    if encoding is not None and len(body) >= MIN_COMPRESS_BYTES:
+        return COMPRESSORS[encoding](body), encoding
+    return body, None
+
+
+def store(entry, value):
+    _cache[entry] = value
+    if len(_cache) > CACHE_ENTRIES:
+        _cache.popitem(last=False)
+
+
+async def encoded_response(request: Request, key: str, load, format: str = None, cache_key=None, extra=None):
+    """
+    Awaits load() for the rows and builds the response in the negotiated format and encoding.
+    With a cache_key (finished seasons only) the final compressed bytes are cached until
+    team_stats changes, and a cache hit skips load() and the database entirely.
+    """
+    format = negotiate_format(request, format)
+    encoding = negotiate_encoding(request)
+
+    # Taken before load(), so a body loaded across a data change is filed under the old generation
+    entry = (data_version.generation, cache_key, format, encoding)
+    cached = _cache.get(entry) if cache_key is not None else None
+    if cached is not None:
+        _cache.move_to_end(entry)
+        body, encoding = cached
+    else:
+        body, encoding = compress(encode_body(key, await load(), format, extra), encoding)
+        if cache_key is not None:
+            store(entry, (body, encoding))
+
+    headers = {"Vary": "Accept, Accept-Encoding"}
+    if encoding is not None:
+        headers["Content-Encoding"] = encoding
+    if cache_key is not None:
+        headers["Cache-Control"] = f"public, max-age={CACHE_MAX_AGE}"
+    return Response(content=body, media_type=MEDIA_TYPES[format], headers=headers)
+
+
+async def prime(key: str, load, cache_key, formats=("records",), extra=None):
+    """
+    Fills the cache for a route ahead of its first request: one load(), then a body for each
+    format and each supported encoding (plus identity), as encoded_response would cache them.
+    """
+    generation = data_version.generation
+    rows = await load()
+    for format in formats:
+        body = encode_body(key, rows, format, extra)
+        for encoding in (*[name for name in PREFERENCE if name in COMPRESSORS], None):
+            store((generation, cache_key, format, encoding), compress(body, encoding))
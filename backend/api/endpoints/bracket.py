@@ -0,0 +1,145 @@
+from fastapi import APIRouter, Query, Depends, HTTPException
+from sqlalchemy.future import select
+from backend.api.base import BaseHandler
+from backend.api.data_version import data_version
+from backend.models.matchup import matchup_diffs_query
+from backend.models.team_stats import TeamStats
+from backend.analysis.features import matchup_arrays, team_stat_matrix
+from backend.analysis.model import LogisticModel
+from backend.analysis import bracket
+import numpy as np
+
+router = APIRouter()
+
+# Fit once per team_stats version, since the matchup diffs it is fit on come from team_stats
+_model = None
+_model_generation = None
+
+
+class BracketHandler(BaseHandler):
+    """Builds 2025 bracket probabilities and optimal brackets from the matchups model."""
+
+    async def get_model(self):
+        global _model, _model_generation
+        if _model is None or _model_generation != data_version.generation:
+            generation = data_version.generation
+            result = await self.db.execute(matchup_diffs_query())
+            X, y, _ = matchup_arrays(result.all())
+            _model, _model_generation = LogisticModel().fit(X, y), generation
+        return _model
+
+    async def get_field(self):
+        """Returns (teams, seeds, P) for the 2025 field in bracket order."""
+        teams = bracket.bracket_teams()
+        query = select(TeamStats).where(
+            (TeamStats.year == 2025) &
+            (TeamStats.team.in_(teams))
+        )
+        result = await self.db.execute(query)
+        rows = {t.team: t for t in result.scalars().all()}
+
+        missing = [team for team in teams if team not in rows]
+        if missing:
+            raise HTTPException(status_code=404, detail=f"teams not in table: {', '.join(missing)}")
+
+        model = await self.get_model()
+        field = [rows[team] for team in teams]
+        P = model.pairwise_proba(team_stat_matrix(field))
+        seeds = [t.seed for t in field]
+        return teams, seeds, P
+
+    async def get_advancement(self):
+        """Probability of each team winning each round."""
+        teams, seeds, P = await self.get_field()
+        adv = bracket.advancement_probabilities(P)
+        return [
+            {
+                "team": team,
+                "seed": seed,
+                "region": bracket.BRACKET_2025[i // 2][0],
+                **{name: round(float(adv[i, r]), 4) for r, name in enumerate(bracket.ROUND_NAMES)},
+            }
+            for i, (team, seed) in enumerate(zip(teams, seeds))
+        ]
+
+    async def get_optimal_bracket(self, pool_size: int = 1, scoring=bracket.DEFAULT_SCORING):
+        """
+        Highest expected-score bracket via exact DP. For pools larger than one, contrarian
+        variants are generated as well and ranked by Monte Carlo chance of winning the pool.
+        """
+        teams, seeds, P = await self.get_field()
+        adv = bracket.advancement_probabilities(P)
+        standard = bracket.optimal_bracket(adv, scoring)
+
+        if pool_size <= 1:
+            return {
+                "method": "exact",
+                "expected_score": round(bracket.expected_score(standard, adv, scoring), 2),
+                "bracket": self.format_picks(standard, teams),
+            }
+
+        P_public = bracket.public_proba(seeds)
+        ownership = bracket.advancement_probabilities(P_public)
+        candidates = [standard]
+        for exponent in bracket.CONTRARIAN_EXPONENTS:
+            picks = bracket.optimal_bracket(adv, scoring, bracket.pick_weights(ownership, pool_size, exponent))
+            if not any(np.array_equal(picks, c) for c in candidates):
+                candidates.append(picks)
+
+        win_probs = await bracket.pool_win_probabilities(P, P_public, candidates, scoring, pool_size)
+        best = int(np.argmax(win_probs))
+
+        return {
+            "method": "exact+monte_carlo",
+            "pool_size": pool_size,
+            "expected_score": round(bracket.expected_score(candidates[best], adv, scoring), 2),
+            "pool_win_probability": round(float(win_probs[best]), 4),
+            "bracket": self.format_picks(candidates[best], teams),
+            "candidates": [
+                {
+                    "champion": teams[picks[-1]],
+                    "expected_score": round(bracket.expected_score(picks, adv, scoring), 2),
+                    "pool_win_probability": round(float(p), 4),
+                }
+                for picks, p in zip(candidates, win_probs)
+            ],
+        }
+
+    @staticmethod
+    def format_picks(picks, teams):
+        formatted, offset = [], 0
+        for r, name in enumerate(bracket.ROUND_NAMES):
+            games = len(teams) >> (r + 1)
+            formatted.append({"round": name, "winners": [teams[t] for t in picks[offset:offset + games]]})
+            offset += games
+        return formatted
+
+
+def parse_scoring(scoring: str):
+    try:
+        points = tuple(int(p) for p in scoring.split(","))
+    except ValueError:
+        points = ()
+    if len(points) != len(bracket.ROUND_NAMES):
+        raise HTTPException(status_code=400, detail="scoring must be 6 comma-separated integers")
+    return points
+
+
+@router.get("/2025/probabilities")
+async def get_advancement_probabilities(
+    handler: BracketHandler = Depends()
+):
+    """Fetch each 2025 team's probability of winning each round."""
+    probabilities = await handler.get_advancement()
+    return {"advancement": probabilities}
+
+
+@router.get("/2025/optimal")
+async def get_optimal_bracket(
+    pool_size: int = Query(1, ge=1, description="Number of entries in the pool"),
+    scoring: str = Query("1,2,4,8,16,32", description="Points per correct pick in each round"),
+    handler: BracketHandler = Depends()
+):
+    """Fetch the bracket that maximizes expected score (or pool win chance for large pools)."""
+    optimal = await handler.get_optimal_bracket(pool_size, parse_scoring(scoring))
+    return {"optimal_bracket": optimal}
@@ -0,0 +1,160 @@
+from fastapi import APIRouter, Depends, Header, HTTPException, Request
+from fastapi.responses import StreamingResponse
+from typing import Literal
+from pydantic import BaseModel, model_validator
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.future import select
+from backend.api.broadcast import broadcaster, Broadcaster
+from backend.api.endpoints.matchups import MatchupHandler
+from backend.models.game_result import GameResult
+import asyncio
+import os
+import secrets
+
+router = APIRouter()
+
+KEEPALIVE_SECONDS = 15
+
+class GameResultIn(BaseModel):
+    year: int = 2025
+    round_name: str
+    teamA: str
+    teamB: str
+    score_teamA: int
+    score_teamB: int
+    status: Literal["in_progress", "final"] = "in_progress"
+
+    @model_validator(mode="after")
+    def check_final(self):
+        if self.status == "final" and self.score_teamA == self.score_teamB:
+            raise ValueError("a final result cannot be tied")
+        return self
+
+    def canonical(self):
+        """The same game with teams in alphabetical order (scores swapped to match)."""
+        if self.teamA.casefold() <= self.teamB.casefold():
+            return self
+        return self.model_copy(update={
+            "teamA": self.teamB, "teamB": self.teamA,
+            "score_teamA": self.score_teamB, "score_teamB": self.score_teamA,
+        })
+
+class LiveHandler(MatchupHandler):
+    """Records live results and builds the change messages pushed to subscribers."""
+
+    async def record_result(self, game: GameResultIn):
+        """
+        Upserts a result; returns the change message, or None when nothing changed. A game is
+        one row whichever order its teams are posted in; when two first posts of a game race,
+        the loser of the insert retries as an update. A final result can be corrected but not
+        reopened: a late in_progress post for a final game is rejected with 409.
+        """
+        game = game.canonical()
+        fields = ("score_teamA", "score_teamB", "round_name", "status")
+        query = select(GameResult).where(
+            (GameResult.year == game.year) &
+            (GameResult.teamA == game.teamA) &
+            (GameResult.teamB == game.teamB)
+        ).with_for_update()  # Holds the row until commit, so a concurrent in_progress post cannot slip past the final check
+        for attempt in range(2):
+            result = await self.db.scalar(query)
+            if result is None:
+                result = GameResult(**game.model_dump())
+                self.db.add(result)
+            elif all(getattr(result, field) == getattr(game, field) for field in fields):
+                return None
+            elif result.status == "final" and game.status != "final":
+                raise HTTPException(status_code=409, detail="game is already final")
+            else:
+                for field in fields:
+                    setattr(result, field, getattr(game, field))
+            try:
+                await self.db.commit()
+                break
+            except IntegrityError:
+                await self.db.rollback()
+                if attempt:
+                    raise
+
+        message = self.format_result(result)
+        if game.year == 2025:
+            matchup_stats = await self.get_matchup_stats(game.teamA, game.teamB)
+            if isinstance(matchup_stats, dict):
+                message["diffs"] = {k: v for k, v in matchup_stats.items() if k.startswith("diff_")}
+        return message
+
+    async def get_results(self, year: int):
+        result = await self.db.execute(select(GameResult).where(GameResult.year == year).order_by(GameResult.id))
+        return [self.format_result(r) for r in result.scalars().all()]
+
+    @staticmethod
+    def format_result(result):
+        return {
+            "year": result.year,
+            "round_name": result.round_name,
+            "teamA": result.teamA,
+            "teamB": result.teamB,
+            "score_teamA": result.score_teamA,
+            "score_teamB": result.score_teamB,
+            "status": result.status,
+            # Only a final score has a winner; a leader mid-game is not one
+            "winner": (result.teamA if result.score_teamA > result.score_teamB else result.teamB) if result.status == "final" else None,
+        }
+
+def require_api_key(x_api_key: str = Header(None)):
+    """Posting results requires an X-API-Key matching RESULTS_API_KEY; with no key configured, posting is disabled."""
+    api_key = os.getenv("RESULTS_API_KEY")
+    if not api_key:
+        raise HTTPException(status_code=503, detail="result posting is disabled (RESULTS_API_KEY is not set)")
+    if x_api_key is None or not secrets.compare_digest(x_api_key, api_key):
+        raise HTTPException(status_code=401, detail="invalid API key")
+
+async def event_stream(request: Request, queue):
+    """Yields SSE frames from a subscriber queue, with keepalive comments while idle."""
+    try:
+        while True:
+            try:
+                message = await asyncio.wait_for(queue.get(), timeout=KEEPALIVE_SECONDS)
+            except asyncio.TimeoutError:
+                # Stop if the client left or the broadcaster dropped this (lagging) subscriber
+                if await request.is_disconnected() or queue not in broadcaster.subscribers:
+                    break
+                yield ": keepalive\n\n"
+                continue
+            yield Broadcaster.format(message)
+    finally:
+        broadcaster.unsubscribe(queue)
+
+@router.post("/results", dependencies=[Depends(require_api_key)])
+async def post_result(
+    game: GameResultIn,
+    handler: LiveHandler = Depends()
+):
+    """Record a game's score (status in_progress or final) and push it to every stream subscriber if it changed."""
+    message = await handler.record_result(game)
+    if message is None:
+        return {"changed": False}
+    event_id = broadcaster.publish("result", message)
+    return {"changed": True, "event_id": event_id, "result": message}
+
+@router.get("/results/{year}")
+async def get_results(
+    year: int,
+    handler: LiveHandler = Depends()
+):
+    """Fetch every recorded result for a year (the snapshot to load before subscribing)."""
+    results = await handler.get_results(year)
+    return {"results": results}
+
+@router.get("/stream")
+async def stream_results(
+    request: Request,
+    last_event_id: int = Header(None, alias="Last-Event-ID")
+):
+    """Server-sent events: one 'result' event per changed game."""
+    queue = broadcaster.subscribe(last_event_id)
+    return StreamingResponse(
+        event_stream(request, queue),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
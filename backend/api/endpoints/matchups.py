@@ -1,85 +1,80 @@
-from fastapi import APIRouter, Query, Depends
+from fastapi import APIRouter, Query, Depends, Request, HTTPException
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
 from backend.api.base import BaseHandler
-from backend.models.matchup import Matchup
-import json
+from backend.api.singleflight import coalesced
+from backend.api.data_version import data_version
+from backend.api.encoding import encoded_response, immutable_years, LIVE_YEAR
+from backend.api.filters import QueryFilter, filter_params
+from backend.analysis.transforms import apply_transforms, parse_transforms, clear_moments
+from sqlalchemy.orm import aliased
+from backend.models.matchup import Matchup, matchup_diffs_query, diff_columns
 from backend.models.team_stats import TeamStats
 import itertools
 
 router = APIRouter()
+data_version.on_change(clear_moments)
+
+def filter_columns(query):
+    """Filterable columns of a matchup_diffs_query: the stored outcome plus its diff_* expressions."""
+    return {col.name: col for col in query.selected_columns if col.name in ("year", "winner") or col.name.startswith("diff_")}
+
+# Names for validating filters; each query compiles against its own aliases
+FILTER_COLUMNS = filter_columns(matchup_diffs_query())
 
 class MatchupHandler(BaseHandler):
     """Handles database queries related to matchups."""
 
-    async def get_matchups(self, start_year: int = None, end_year: int = None):
-        query = select(Matchup)
+    @coalesced
+    async def get_matchups(self, start_year: int = None, end_year: int = None, query_filter: QueryFilter = None):
+        query = matchup_diffs_query()
         if start_year and end_year:
             query = query.where(Matchup.year.between(start_year, end_year))
+        if query_filter:
+            query = query_filter.apply_sql(query, filter_columns(query), tiebreak=Matchup.id)
             
         result = await self.db.execute(query)
-        matchups = result.scalars().all()
+        matchups = [dict(row) for row in result.mappings().all()]
 
-        # Convert NaN values to None (JSON-compatible)
-        matchups_clean = json.loads(json.dumps([m.__dict__ for m in matchups], default=str))
-        for matchup in matchups_clean:
+        # Convert NaN values to None (JSON-compatible) and trim diffs to 3 decimals
+        for matchup in matchups:
             for key, value in matchup.items():
-                if isinstance(value, float) and (value != value):  # NaN check
-                    matchup[key] = None
+                if isinstance(value, float):
+                    matchup[key] = None if value != value else round(value, 3)  # NaN check
+
+        return matchups
 
-        return matchups_clean
+    async def get_transformed_matchups(self, start_year: int = None, end_year: int = None, transforms=(), query_filter: QueryFilter = None):
+        """
+        Matchups with server-side transforms (orient, augment, zscore) applied. Filters refer to
+        the transformed values, so with transforms they run in memory instead of in SQL.
+        """
+        if not transforms:
+            return await self.get_matchups(start_year, end_year, query_filter)
+        version = data_version.generation  # Before the read, so moments are never filed under a newer version
+        matchups = apply_transforms(await self.get_matchups(start_year, end_year), transforms, frozen_before=LIVE_YEAR, version=version)
+        return query_filter.apply_rows(matchups) if query_filter else matchups
     
+    @coalesced
     async def get_matchup_stats(self, teamA: str, teamB: str):
         """Fetches team stats for 2025 and calculates matchup differences."""
-        query = select(TeamStats).where(
-            (TeamStats.year == 2025) & 
-            (TeamStats.team.in_([teamA, teamB]))
+        if teamA == teamB:
+            return "one or both of the teams not in table"
+
+        team1, team2 = aliased(TeamStats), aliased(TeamStats)
+        query = (
+            select(team1.year, team1.team.label("teamA"), team2.team.label("teamB"), *diff_columns(team1, team2))
+            .join(team2, (team2.year == team1.year) & (team2.team == teamB))
+            .where((team1.year == 2025) & (team1.team == teamA))
         )
 
         result = await self.db.execute(query)
-        teams = result.scalars().all()
+        row = result.mappings().first()
 
-        if len(teams) != 2:
+        if row is None:
             return "one or both of the teams not in table"
 
-        # Assign teams dynamically
-        team1, team2 = (teams[0], teams[1]) if teams[0].team == teamA else (teams[1], teams[0])
-
-        # Compute matchup differences
-        matchup_stats = {
-            "year": team1.year,
-            "teamA": team1.team,
-            "teamB": team2.team,
-            "diff_seed": (team1.seed or 0) - (team2.seed or 0),
-            "diff_win_pct": (team1.win_pct or 0) - (team2.win_pct or 0),
-            "diff_ps_per_game": team1.ps_per_game - team2.ps_per_game,
-            "diff_pa_per_game": team1.pa_per_game - team2.pa_per_game,
-            "diff_srs": team1.srs - team2.srs,
-            "diff_sos": team1.sos - team2.sos,
-            "diff_fg_per_game": team1.fg_per_game - team2.fg_per_game,
-            "diff_fga_per_game": team1.fga_per_game - team2.fga_per_game,
-            "diff_fg_pct": team1.fg_pct - team2.fg_pct,
-            "diff_fg2_per_game": team1.fg2_per_game - team2.fg2_per_game,
-            "diff_fg2a_per_game": team1.fg2a_per_game - team2.fg2a_per_game,
-            "diff_fg2_pct": team1.fg2_pct - team2.fg2_pct,
-            "diff_fg3_per_game": team1.fg3_per_game - team2.fg3_per_game,
-            "diff_fg3a_per_game": team1.fg3a_per_game - team2.fg3a_per_game,
-            "diff_fg3_pct": team1.fg3_pct - team2.fg3_pct,
-            "diff_ft_per_game": team1.ft_per_game - team2.ft_per_game,
-            "diff_fta_per_game": team1.fta_per_game - team2.fta_per_game,
-            "diff_ft_pct": team1.ft_pct - team2.ft_pct,
-            "diff_orb_per_game": team1.orb_per_game - team2.orb_per_game,
-            "diff_drb_per_game": team1.drb_per_game - team2.drb_per_game,
-            "diff_trb_per_game": team1.trb_per_game - team2.trb_per_game,
-            "diff_ast_per_game": team1.ast_per_game - team2.ast_per_game,
-            "diff_stl_per_game": team1.stl_per_game - team2.stl_per_game,
-            "diff_blk_per_game": team1.blk_per_game - team2.blk_per_game,
-            "diff_tov_per_game": team1.tov_per_game - team2.tov_per_game,
-            "diff_pf_per_game": team1.pf_per_game - team2.pf_per_game,
-            "diff_offensive_rating": team1.offensive_rating - team2.offensive_rating,
-            "diff_defensive_rating": team1.defensive_rating - team2.defensive_rating,
-        }
-        matchup_stats = {k: round(v, 3) if isinstance(v, float) else v for k, v in matchup_stats.items()}
+        matchup_stats = {k: round(v, 3) if isinstance(v, float) else v for k, v in row.items()}
 
         return matchup_stats
 
@@ -233,24 +228,46 @@ class MatchupHandler(BaseHandler):
 
         return formatted_matchups
     
+def listing_cache_key(start_year: int = None, end_year: int = None, transforms=(), query_filter: QueryFilter = QueryFilter()):
+    """Encoded-body cache key of a matchups listing; None unless it covers finished seasons only."""
+    return ("matchups", start_year, end_year, transforms, query_filter.key) if immutable_years(start_year, end_year) else None
+
+def transforms_param(
+    transform: str = Query(None, description="Comma-separated transforms: orient, augment, zscore")
+):
+    try:
+        return tuple(sorted(parse_transforms(transform)))
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
 @router.get("/")
 async def get_matchups(
+    request: Request,
     start_year: int = Query(None, description="Start Year of Matchups"),
     end_year: int = Query(None, description="End Year of Matchups"),
+    format: str = Query(None, description="records (default), split or msgpack"),
+    transforms: tuple = Depends(transforms_param),
+    query_filter: QueryFilter = Depends(filter_params(FILTER_COLUMNS)),
     handler: MatchupHandler = Depends()
 ):
-    """Fetch matchups from the database, optionally filtered by year."""
-    matchups = await handler.get_matchups(start_year, end_year)
-    return {"matchups": matchups}
+    """Fetch matchups from the database, optionally filtered by year or a where expression."""
+    cache_key = listing_cache_key(start_year, end_year, transforms, query_filter)
+    load = lambda: handler.get_transformed_matchups(start_year, end_year, transforms, query_filter)
+    return await encoded_response(request, "matchups", load, format, cache_key)
 
 @router.get("/year/{year}")
 async def get_matchups_by_year(
+    request: Request,
     year: int,
+    format: str = Query(None, description="records (default), split or msgpack"),
+    transforms: tuple = Depends(transforms_param),
+    query_filter: QueryFilter = Depends(filter_params(FILTER_COLUMNS)),
     handler: MatchupHandler = Depends()
 ):
     """Fetch matchups for a specific year."""
-    matchups = await handler.get_matchups(start_year=year, end_year=year)
-    return {"matchups": matchups}
+    cache_key = listing_cache_key(year, year, transforms, query_filter)
+    load = lambda: handler.get_transformed_matchups(year, year, transforms, query_filter)
+    return await encoded_response(request, "matchups", load, format, cache_key)
 
 @router.get("/2025")
 async def get_dynamic_matchup(
@@ -0,0 +1,34 @@
+from fastapi import APIRouter, Depends
+from sqlalchemy.future import select
+from backend.api.base import BaseHandler
+from backend.api.singleflight import coalesced
+from backend.models.team_rating import TeamRating
+
+router = APIRouter()
+
+class RatingsHandler(BaseHandler):
+    """Handles reads from the precomputed team_ratings table."""
+
+    @coalesced
+    async def get_ratings(self, year: int):
+        query = select(TeamRating).where(TeamRating.year == year).order_by(TeamRating.rating.desc())
+        result = await self.db.execute(query)
+
+        return [
+            {
+                "team": r.team,
+                "pre_rating": round(r.pre_rating, 1),
+                "rating": round(r.rating, 1),
+                "games": r.games,
+            }
+            for r in result.scalars().all()
+        ]
+
+@router.get("/{year}")
+async def get_ratings_by_year(
+    year: int,
+    handler: RatingsHandler = Depends()
+):
+    """Fetch Elo ratings for every rated team as of a specific year."""
+    ratings = await handler.get_ratings(year)
+    return {"ratings": ratings}
@@ -1,16 +1,25 @@
-from fastapi import APIRouter, Query, Depends
+from fastapi import APIRouter, Query, Depends, Request
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
 from backend.api.base import BaseHandler
+from backend.api.singleflight import coalesced
+from backend.api.encoding import encoded_response, immutable_years
+from backend.api.filters import QueryFilter, filter_params, numeric_columns
 from backend.models.team_stats import TeamStats
+from backend.api.endpoints.ratings import RatingsHandler
+from backend.analysis.features import team_slug
+from backend.analysis.ratings import INITIAL_RATING
 import json
 
 router = APIRouter()
 
+FILTER_COLUMNS = numeric_columns(TeamStats)
+
 class TeamStatsHandler(BaseHandler):
     """Handles database queries related to team stats."""
 
-    async def get_team_stats(self, start_year: int = None, end_year: int = None, team: str = None):
+    @coalesced
+    async def get_team_stats(self, start_year: int = None, end_year: int = None, team: str = None, query_filter: QueryFilter = None):
         query = select(TeamStats)
 
         if start_year and end_year:
@@ -21,6 +30,9 @@ class TeamStatsHandler(BaseHandler):
         if team:
             query = query.where(TeamStats.team.ilike(f"%{team}%"))  # Case-insensitive search
 
+        if query_filter:
+            query = query_filter.apply_sql(query, FILTER_COLUMNS, tiebreak=TeamStats.id)
+
         result = await self.db.execute(query)
         teams = result.scalars().all()
 
@@ -33,22 +45,41 @@ class TeamStatsHandler(BaseHandler):
 
         return teams_clean
 
+def listing_cache_key(start_year: int = None, end_year: int = None, team: str = None, query_filter: QueryFilter = QueryFilter()):
+    """Encoded-body cache key of a team stats listing; None unless it covers finished seasons only."""
+    return ("team_stats", start_year, end_year, team, query_filter.key) if immutable_years(start_year, end_year) else None
+
 @router.get("/")
 async def get_team_stats(
+    request: Request,
     start_year: int = Query(None, description="Filter by Start Year"),
     end_year: int = Query(None, description="Filter by End Year"),
     team: str = Query(None, description="Filter by Team Name"),
+    format: str = Query(None, description="records (default), split or msgpack"),
+    query_filter: QueryFilter = Depends(filter_params(FILTER_COLUMNS)),
     handler: TeamStatsHandler = Depends()
 ):
-    """Fetch team stats from the database, optionally filtered by a range of years or team name."""
-    team_stats = await handler.get_team_stats(start_year, end_year, team)
-    return {"team_stats": team_stats}
+    """Fetch team stats from the database, optionally filtered by years, team name or a where expression."""
+    cache_key = listing_cache_key(start_year, end_year, team, query_filter)
+    load = lambda: handler.get_team_stats(start_year, end_year, team, query_filter)
+    return await encoded_response(request, "team_stats", load, format, cache_key)
 
 @router.get("/year/{year}")
 async def get_team_stats_by_year(
+    request: Request,
     year: int,
-    handler: TeamStatsHandler = Depends()
+    format: str = Query(None, description="records (default), split or msgpack"),
+    handler: TeamStatsHandler = Depends(),
+    ratings: RatingsHandler = Depends()
 ):
-    """Fetch team stats for a specific year."""
-    team_stats = await handler.get_team_stats(start_year=year, end_year=year)
-    return {"team_stats": team_stats}
\ No newline at end of file
+    """Fetch team stats for a specific year, with each team's pre-tournament Elo rating."""
+    async def load():
+        team_stats = await handler.get_team_stats(start_year=year, end_year=year)
+
+        # Ratings are keyed by team slug; teams with no tournament history start at the initial rating.
+        # Copy rows since results are shared
+        elo = {r["team"]: r["pre_rating"] for r in await ratings.get_ratings(year)}
+        return [{**team, "elo_rating": elo.get(team_slug(team["team"]), INITIAL_RATING)} for team in team_stats]
+
+    cache_key = ("team_stats_year", year) if immutable_years(year, year) else None
+    return await encoded_response(request, "team_stats", load, format, cache_key)
\ No newline at end of file
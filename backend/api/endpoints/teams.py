@@ -0,0 +1,140 @@
+from collections import defaultdict
+import asyncio
+import numpy as np
+from fastapi import APIRouter, Depends, HTTPException, Request
+from sqlalchemy.future import select
+from backend.api.base import BaseHandler
+from backend.api.data_version import data_version
+from backend.api.encoding import encoded_response
+from backend.api.endpoints.matchups import MatchupHandler
+from backend.api.endpoints.team_stats import TeamStatsHandler
+from backend.models.matchup import Matchup
+from backend.analysis.bracket import ROUND_NAMES
+from backend.analysis.features import team_slug, game_rounds
+
+router = APIRouter()
+
+class TeamIndex:
+    """
+    Team -> row offsets into every team_stats and matchups row, built once from bulk reads.
+    Keys are team_slug() slugs, so a program keeps one history across renames (UConn and
+    Connecticut), similarly named programs stay apart (Miami (FL) and Miami (OH)), and lookups
+    are exact and cost O(rows for that team). Games reach teams through teamA_id/teamB_id.
+    The index is rebuilt on first use after team_stats changes.
+    """
+
+    def __init__(self):
+        self.stats = []
+        self.games = []
+        self.sides = []    # per game: ((teamA slug, name), (teamB slug, name))
+        self.rounds = None
+        self.offsets = {}  # key -> (team_stats offsets, matchups offsets)
+        self.names = {}    # key -> most recent display name
+        self.built = None  # data_version generation the index was built from
+        self.lock = asyncio.Lock()
+
+    async def ensure(self, db):
+        if self.built != data_version.generation:
+            async with self.lock:
+                if self.built != data_version.generation:
+                    await self.build(db)
+
+    async def build(self, db):
+        generation = data_version.generation
+        stats = await TeamStatsHandler(db).get_team_stats()
+        games = await MatchupHandler(db).get_matchups()
+        team_ids = {id: (a, b) for id, a, b in (await db.execute(select(Matchup.id, Matchup.teamA_id, Matchup.teamB_id))).all()}
+        stats = sorted(({k: v for k, v in row.items() if not k.startswith("_")} for row in stats), key=lambda row: (row["year"], row["team"]))
+
+        stat_offsets, game_offsets = defaultdict(list), defaultdict(list)
+        teams = {}  # team_stats.id -> (slug, name that season)
+        names = {}
+        for i, row in enumerate(stats):
+            key = team_slug(row["team"])
+            stat_offsets[key].append(i)
+            teams[row["id"]] = (key, row["team"])
+            names[key] = row["team"]
+
+        # A game without a team_stats reference falls back to its stored name
+        sides = []
+        for game in games:
+            ids = team_ids.get(game["id"], (None, None))
+            sides.append(tuple(teams.get(id) or (team_slug(game[side]), game[side]) for id, side in zip(ids, ("teamA", "teamB"))))
+        years = np.array([g["year"] for g in games])
+        rounds = game_rounds(years, [a[0] for a, _ in sides], [b[0] for _, b in sides], [g["winner"] for g in games])
+        # Offsets are kept in (year, round) order
+        for i in np.lexsort((rounds, years)):
+            game_offsets[sides[i][0][0]].append(i)
+            game_offsets[sides[i][1][0]].append(i)
+
+        self.stats, self.games, self.sides, self.rounds, self.names = stats, games, sides, rounds, names
+        self.offsets = {
+            key: (np.array(stat_offsets.get(key, []), dtype=np.int32), np.array(game_offsets.get(key, []), dtype=np.int32))
+            for key in stat_offsets.keys() | game_offsets.keys()
+        }
+        self.built = generation
+
+    def find(self, team: str):
+        """The index key for a team name or slug, or None when no such team exists."""
+        key = team_slug(team)
+        return key if key in self.offsets else None
+
+    def history(self, key: str):
+        stat_rows, game_rows = self.offsets[key]
+
+        games = []
+        for i in game_rows:
+            game = self.games[i]
+            teamA, teamB = self.sides[i]
+            is_teamA = teamA[0] == key
+            sign = 1 if is_teamA else -1
+            round_number = int(self.rounds[i])
+            games.append({
+                "year": game["year"],
+                "round": round_number,
+                "round_name": ROUND_NAMES[round_number - 1],
+                "opponent": teamB[1] if is_teamA else teamA[1],
+                "won": game["winner"] == (1 if is_teamA else 0),
+                # Differences from this team's side
+                **{k: (None if v is None else round(sign * v, 3)) for k, v in game.items() if k.startswith("diff_")},
+            })
+
+        wins = sum(game["won"] for game in games)
+        return {
+            "team": self.names.get(key, key),
+            "summary": {
+                "seasons": len(stat_rows),
+                "games": len(games),
+                "wins": wins,
+                "losses": len(games) - wins,
+            },
+            "seasons": [self.stats[i] for i in stat_rows],
+            "games": games,
+        }
+
+# Built on first use (or during warm-up) and shared by every request in this process
+team_index = TeamIndex()
+
+class TeamsHandler(BaseHandler):
+    """Serves per-team reads from the in-process team index."""
+
+    async def find_team(self, team: str):
+        await team_index.ensure(self.db)
+        return team_index.find(team)
+
+    async def get_history(self, key: str):
+        await team_index.ensure(self.db)
+        return team_index.history(key)
+
+@router.get("/{team}/history")
+async def get_team_history(
+    request: Request,
+    team: str,
+    handler: TeamsHandler = Depends()
+):
+    """Fetch a team's season stats and every tournament game it played, by team name or Sports-Reference slug."""
+    key = await handler.find_team(team)
+    if key is None:
+        raise HTTPException(status_code=404, detail=f"no team named {team!r}")
+    # The encoded body is cached per team until team_stats changes
+    return await encoded_response(request, "history", lambda: handler.get_history(key), cache_key=("team_history", key))
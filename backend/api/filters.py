@@ -0,0 +1,214 @@
+'''
+Compact filter expressions over numeric columns, e.g.
+
+    where=seed = 12 and srs > 10 and year >= 2010
+    where=diff_seed >= 8 and winner = 0
+    sort=-srs,year&limit=25
+
+Grammar:  expr := term ("or" term)*,  term := factor ("and" factor)*,
+          factor := "(" expr ")" | column op number,  op := = == != < <= > >=
+
+Expressions are parsed once into a small tree, validated against the allowed columns, and then
+compiled to a SQL WHERE clause or evaluated as NumPy masks over rows already in memory.
+Comparisons against missing values (NULL / NaN) are false in both.
+'''
+
+import operator
+import re
+import numpy as np
+from fastapi import HTTPException, Query
+from sqlalchemy import and_, or_, Float, Integer
+
+MAX_LENGTH = 512
+MAX_LIMIT = 10000
+
+OPS = {"=": operator.eq, "==": operator.eq, "!=": operator.ne, "<": operator.lt, "<=": operator.le, ">": operator.gt, ">=": operator.ge}
+EXPECTED = {"name": "a column", "op": "a comparison", "number": "a number", "paren": "')'"}
+TOKEN = re.compile(r"\s*(?:(?P<number>-?(?:\d+\.?\d*|\.\d+)(?:[eE][-+]?\d+)?)|(?P<name>[A-Za-z_]\w*)|(?P<op>==|!=|<=|>=|=|<|>)|(?P<paren>[()]))")
+
+
+class FilterError(ValueError):
+    pass
+
+
+def numeric_columns(model, exclude=("id",)):
+    """Integer and Float columns of a model, by name."""
+    return {c.name: getattr(model, c.name) for c in model.__table__.columns
+            if isinstance(c.type, (Integer, Float)) and c.name not in exclude and not c.foreign_keys}
+
+
+def tokenize(text: str):
+    tokens, pos = [], 0
+    text = text.strip()
+    while pos < len(text):
+        match = TOKEN.match(text, pos)
+        if match is None or match.end() == pos:
+            raise FilterError(f"unexpected input at position {pos}: {text[pos:pos + 10]!r}")
+        kind = match.lastgroup
+        value = match.group(kind)
+        if kind == "name" and value.lower() in ("and", "or"):
+            kind, value = "bool", value.lower()
+        tokens.append((kind, value))
+        pos = match.end()
+    return tokens
+
+
+def parse_filter(text: str, columns):
+    """Parses an expression into ("and"|"or", [children]) / ("cmp", column, op, value) nodes."""
+    if len(text) > MAX_LENGTH:
+        raise FilterError(f"filter longer than {MAX_LENGTH} characters")
+    tokens = tokenize(text)
+    pos = 0
+
+    def peek():
+        return tokens[pos] if pos < len(tokens) else (None, None)
+
+    def take(kind):
+        nonlocal pos
+        token_kind, value = peek()
+        if token_kind != kind:
+            raise FilterError(f"expected {EXPECTED[kind]} but found {value or 'end of filter'}")
+        pos += 1
+        return value
+
+    def expr(joiner="or"):
+        children = [term() if joiner == "or" else factor()]
+        while peek() == ("bool", joiner):
+            take("bool")
+            children.append(term() if joiner == "or" else factor())
+        return children[0] if len(children) == 1 else (joiner, children)
+
+    def term():
+        return expr("and")
+
+    def factor():
+        if peek() == ("paren", "("):
+            take("paren")
+            node = expr()
+            if take("paren") != ")":
+                raise FilterError("expected ')' but found '('")
+            return node
+        column = take("name")
+        if column not in columns:
+            raise FilterError(f"unknown column {column!r}; filterable columns: {', '.join(sorted(columns))}")
+        op = take("op")
+        return ("cmp", column, op, float(take("number")))
+
+    tree = expr()
+    if pos != len(tokens):
+        raise FilterError(f"unexpected {tokens[pos][1]!r}")
+    return tree
+
+
+def parse_sort(text: str, columns):
+    """'-srs,year' -> [("srs", True), ("year", False)]; a leading '-' sorts descending."""
+    keys = []
+    for part in (text or "").split(","):
+        part = part.strip()
+        if not part:
+            continue
+        name = part.lstrip("-+")
+        if name not in columns:
+            raise FilterError(f"cannot sort by {name!r}")
+        keys.append((name, part.startswith("-")))
+    return keys
+
+
+def render(node):
+    """Canonical text of a tree, used as its cache key. Values are rendered exactly (repr round-trips a float)."""
+    if node[0] == "cmp":
+        _, column, op, value = node
+        return f"{column} {'==' if op == '=' else op} {value!r}"
+    return "(" + f" {node[0]} ".join(render(child) for child in node[1]) + ")"
+
+
+def to_sql(node, columns):
+    if node[0] == "cmp":
+        _, column, op, value = node
+        return OPS[op](columns[column], value)
+    return (and_ if node[0] == "and" else or_)(*(to_sql(child, columns) for child in node[1]))
+
+
+def to_mask(node, arrays):
+    if node[0] == "cmp":
+        _, column, op, value = node
+        values = arrays[column]
+        with np.errstate(invalid="ignore"):
+            mask = OPS[op](values, value)
+        return mask & ~np.isnan(values) if op == "!=" else mask
+    masks = [to_mask(child, arrays) for child in node[1]]
+    return np.logical_and.reduce(masks) if node[0] == "and" else np.logical_or.reduce(masks)
+
+
+class QueryFilter:
+    """A parsed where/sort/limit triple. Hashable, so it can key request coalescing and caches."""
+
+    def __init__(self, where: str = None, sort: str = None, limit: int = None, columns=None):
+        self.tree = parse_filter(where, columns) if where else None
+        self.sort = parse_sort(sort, columns)
+        self.limit = limit
+        self.key = (render(self.tree) if self.tree else None, tuple(self.sort), limit)
+
+    def __bool__(self):
+        return self.key != (None, (), None)
+
+    def __eq__(self, other):
+        return isinstance(other, QueryFilter) and self.key == other.key
+
+    def __hash__(self):
+        return hash(self.key)
+
+    def __repr__(self):
+        return f"QueryFilter{self.key}"
+
+    def apply_sql(self, query, columns, tiebreak=None):
+        """Adds the WHERE clause, ORDER BY and LIMIT to a select."""
+        if self.tree is not None:
+            query = query.where(to_sql(self.tree, columns))
+        if self.sort:
+            # NULLs last in both directions, matching NaN in apply_rows
+            order = [(columns[name].desc() if desc else columns[name].asc()).nulls_last() for name, desc in self.sort]
+            query = query.order_by(None).order_by(*order, *([tiebreak] if tiebreak is not None else []))
+        if self.limit is not None:
+            query = query.limit(self.limit)
+        return query
+
+    def apply_rows(self, rows):
+        """Same semantics over rows in memory: one NumPy mask per comparison, then a stable sort."""
+        if not self or not rows:
+            return rows
+        names = {name for name, _ in self.sort} | set(self.columns_in(self.tree))
+        arrays = {name: np.array([np.nan if row.get(name) is None else row[name] for row in rows], dtype=float) for name in names}
+
+        index = np.arange(len(rows))
+        if self.tree is not None:
+            index = index[to_mask(self.tree, arrays)]
+        if self.sort:
+            # lexsort's last key is primary; NaN sorts last either way
+            keys = [-arrays[name][index] if desc else arrays[name][index] for name, desc in reversed(self.sort)]
+            index = index[np.lexsort(keys)]
+        if self.limit is not None:
+            index = index[:self.limit]
+        return [rows[i] for i in index]
+
+    @staticmethod
+    def columns_in(node):
+        if node is None:
+            return []
+        if node[0] == "cmp":
+            return [node[1]]
+        return [name for child in node[1] for name in QueryFilter.columns_in(child)]
+
+
+def filter_params(columns):
+    """Builds a FastAPI dependency that parses where/sort/limit for the given columns."""
+    def dependency(
+        where: str = Query(None, description="Filter expression, e.g. 'seed = 12 and srs > 10'"),
+        sort: str = Query(None, description="Comma-separated columns; prefix with - for descending"),
+        limit: int = Query(None, ge=1, le=MAX_LIMIT, description="Maximum number of rows")
+    ):
+        try:
+            return QueryFilter(where, sort, limit, columns)
+        except FilterError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+    return dependency
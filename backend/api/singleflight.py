@@ -0,0 +1,63 @@
+import asyncio
+import functools
+
+class SingleFlight:
+    """
+    Coalesces identical concurrent calls: the first caller (the leader) runs the query and
+    everyone arriving while it is in flight awaits the same future. Followers wait at most
+    max_wait seconds before running the query themselves.
+    Results are shared between requests, so callers must treat them as read-only.
+    """
+
+    def __init__(self, max_wait: float = 5.0):
+        self.max_wait = max_wait
+        self.inflight = {}
+        self.counters = {"leaders": 0, "coalesced": 0, "timeouts": 0, "errors": 0}
+
+    async def do(self, key, fn):
+        future = self.inflight.get(key)
+        if future is not None:
+            self.counters["coalesced"] += 1
+            try:
+                return await asyncio.wait_for(asyncio.shield(future), self.max_wait)
+            except asyncio.TimeoutError:
+                self.counters["timeouts"] += 1
+                return await fn()
+            except asyncio.CancelledError:
+                # The leader's request was cancelled; only re-raise if this request was too
+                if not future.cancelled():
+                    raise
+                return await fn()
+
+        future = asyncio.get_running_loop().create_future()
+        self.inflight[key] = future
+        self.counters["leaders"] += 1
+        try:
+            result = await fn()
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except Exception as e:
+            self.counters["errors"] += 1
+            future.set_exception(e)
+            future.exception()  # Mark retrieved so a leader-only failure doesn't log a warning
+            raise
+        else:
+            future.set_result(result)
+            return result
+        finally:
+            self.inflight.pop(key, None)
+
+    def stats(self):
+        return {**self.counters, "inflight": len(self.inflight)}
+
+# Shared by every handler in this process
+singleflight = SingleFlight()
+
+def coalesced(method):
+    """Handler method decorator: identical concurrent calls share one database round trip."""
+    @functools.wraps(method)
+    async def wrapper(self, *args, **kwargs):
+        key = (method.__qualname__, args, tuple(sorted(kwargs.items())))
+        return await singleflight.do(key, lambda: method(self, *args, **kwargs))
+    return wrapper
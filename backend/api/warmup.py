@@ -0,0 +1,39 @@
+import asyncio
+import logging
+from backend.db_conn import SessionFactory, warm_pool
+from backend.api.encoding import prime, LIVE_YEAR
+from backend.api.endpoints import matchups, team_stats
+from backend.api.endpoints.bracket import BracketHandler
+from backend.api.endpoints.teams import team_index
+
+logger = logging.getLogger(__name__)
+
+# The full historical listings: the largest bodies, and the ones every analysis starts from
+FIRST_YEAR, LAST_FINISHED_YEAR = 1991, LIVE_YEAR - 1
+
+async def prime_hot_queries():
+    """Fills the caches the busiest routes read from: encoded historical listings, the bracket model and the team index."""
+    async with SessionFactory() as session:
+        years = (FIRST_YEAR, LAST_FINISHED_YEAR)
+        handler = matchups.MatchupHandler(session)
+        await prime("matchups", lambda: handler.get_transformed_matchups(*years), matchups.listing_cache_key(*years))
+        handler = team_stats.TeamStatsHandler(session)
+        await prime("team_stats", lambda: handler.get_team_stats(*years), team_stats.listing_cache_key(*years))
+        await BracketHandler(session).get_model()
+        await team_index.ensure(session)
+
+async def warm_up(app, max_delay: float = 30.0):
+    """Warms the pool and primes queries, retrying with backoff; marks the app ready when done."""
+    delay = 1.0
+    while True:
+        try:
+            await warm_pool()
+            await prime_hot_queries()
+        except Exception as e:
+            logger.warning("warm-up failed, retrying in %.0fs: %s", delay, e)
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, max_delay)
+        else:
+            app.state.ready = True
+            logger.info("warm-up complete")
+            return
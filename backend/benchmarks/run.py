@@ -0,0 +1,216 @@
+'''
+Reproducible benchmarks for the API.
+
+    python -m backend.benchmarks.run                          # seed, run, write benchmark_results.json
+    python -m backend.benchmarks.run --save-baseline          # also store the results as the baseline
+    python -m backend.benchmarks.run --baseline baseline.json # fail on regressions against a baseline
+
+Micro-benchmarks call the handler methods directly on a fresh session; the load generator
+drives the ASGI app in-process with a fixed number of concurrent clients. The admission scenario
+bursts a DB-bound route from many clients under tight limits, alongside an in-memory route.
+'''
+
+import argparse
+import asyncio
+import json
+import platform
+import sys
+import time
+from pathlib import Path
+import numpy as np
+from backend.benchmarks import seed as bench_seed
+
+bench_seed.configure()
+
+HERE = Path(__file__).resolve().parent
+DEFAULT_BASELINE = HERE / "baseline.json"
+
+ADMISSION_DB_ROUTE = "/matchups/"
+ADMISSION_MEMORY_ROUTE = "/teams/Duke/history"
+# Per-client buckets stay on but roomy, so the burst is shed by the route queues rather than the rate limit
+ADMISSION_LIMITS = {"ADMISSION_DB_CONCURRENCY": "4", "ADMISSION_DB_QUEUE": "8", "ADMISSION_RATE": "50", "ADMISSION_BURST": "100"}
+
+def bench_key(i: int):
+    return f"bench-{i}"
+
+LOAD_ROUTES = [
+    "/matchups/",
+    "/matchups/year/2024",
+    "/matchups/2025?teamA=Duke&teamB=Houston",
+    "/matchups/2025/round64",
+    "/stats/year/2025",
+    "/stats/?start_year=2020&end_year=2024",
+]
+
+def summarize(latencies, elapsed: float = None):
+    ms = np.array(latencies) * 1000
+    summary = {
+        "count": len(ms),
+        "mean_ms": round(float(ms.mean()), 3),
+        "p50_ms": round(float(np.percentile(ms, 50)), 3),
+        "p99_ms": round(float(np.percentile(ms, 99)), 3),
+    }
+    if elapsed is not None:
+        summary["rps"] = round(len(ms) / elapsed, 1)
+    return summary
+
+async def micro_benchmarks(iterations: int):
+    from backend.db_conn import SessionFactory
+    from backend.api.endpoints.matchups import MatchupHandler
+    from backend.api.endpoints.team_stats import TeamStatsHandler
+
+    cases = {
+        "MatchupHandler.get_matchups": lambda db: MatchupHandler(db).get_matchups(),
+        "MatchupHandler.get_matchup_stats": lambda db: MatchupHandler(db).get_matchup_stats("Duke", "Houston"),
+        "MatchupHandler.get_round_of_64_matchups": lambda db: MatchupHandler(db).get_round_of_64_matchups(),
+        "TeamStatsHandler.get_team_stats": lambda db: TeamStatsHandler(db).get_team_stats(2025, 2025),
+    }
+
+    results = {}
+    for name, call in cases.items():
+        latencies = []
+        for i in range(iterations + 1):
+            async with SessionFactory() as db:
+                start = time.perf_counter()
+                await call(db)
+                if i > 0:  # First call is warm-up
+                    latencies.append(time.perf_counter() - start)
+        results[name] = summarize(latencies)
+    return results
+
+async def load_test(requests_per_route: int, concurrency: int):
+    import httpx
+    from backend.server import app
+
+    results = {}
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://bench") as client:
+        for route in LOAD_ROUTES:
+            await client.get(route)  # Warm-up
+            queue = asyncio.Queue()
+            for _ in range(requests_per_route):
+                queue.put_nowait(route)
+            latencies, errors = [], 0
+
+            async def worker():
+                nonlocal errors
+                while not queue.empty():
+                    path = queue.get_nowait()
+                    start = time.perf_counter()
+                    response = await client.get(path)
+                    latencies.append(time.perf_counter() - start)
+                    errors += response.status_code != 200
+
+            start = time.perf_counter()
+            await asyncio.gather(*[worker() for _ in range(concurrency)])
+            results[route] = {**summarize(latencies, time.perf_counter() - start), "errors": errors}
+    return results
+
+async def admission_test(requests: int, concurrency: int):
+    """
+    Bursts the DB-bound route with tight admission limits while reading an in-memory route.
+    Excess DB requests must be shed with 429 + Retry-After rather than queue without bound.
+    Each of the concurrency clients sends its own X-API-Key, registered in ADMISSION_API_KEYS
+    so admission tells them apart (metrics report one bucket per client).
+    """
+    import os
+    import httpx
+    from backend.server import app
+    from backend.api.admission import admission
+
+    limits = {**ADMISSION_LIMITS, "ADMISSION_API_KEYS": ",".join(bench_key(i) for i in range(concurrency))}
+    saved = {name: os.environ.get(name) for name in limits}
+    os.environ.update(limits)
+    admission.configure()
+    try:
+        async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://bench") as client:
+            await client.get(ADMISSION_MEMORY_ROUTE)  # Warm-up (builds the team index)
+            results = {}
+
+            async def burst(route, n, clients):
+                latencies, statuses, retry_after = [], {}, []
+
+                async def one(i):
+                    start = time.perf_counter()
+                    response = await client.get(route, headers={"X-API-Key": bench_key(i % clients)})
+                    if response.status_code == 200:
+                        latencies.append(time.perf_counter() - start)
+                    statuses[response.status_code] = statuses.get(response.status_code, 0) + 1
+                    if "retry-after" in response.headers:
+                        retry_after.append(int(response.headers["retry-after"]))
+
+                start = time.perf_counter()
+                await asyncio.gather(*[one(i) for i in range(n)])
+                summary = summarize(latencies, time.perf_counter() - start) if latencies else {}
+                return {**summary, "statuses": statuses, "max_retry_after": max(retry_after, default=None)}
+
+            db, memory = await asyncio.gather(
+                burst(ADMISSION_DB_ROUTE, requests, concurrency),
+                burst(ADMISSION_MEMORY_ROUTE, requests, concurrency),
+            )
+            results[ADMISSION_DB_ROUTE] = db
+            results[ADMISSION_MEMORY_ROUTE] = memory
+            results["metrics"] = admission.stats()
+            return results
+    finally:
+        for name, value in saved.items():
+            if value is None:
+                os.environ.pop(name, None)
+            else:
+                os.environ[name] = value
+        admission.configure()
+
+def compare(results, baseline, threshold: float):
+    """Returns a list of regressions: metrics slower than baseline by more than threshold."""
+    regressions = []
+    for section in ("micro", "load"):
+        for name, current in results.get(section, {}).items():
+            previous = baseline.get(section, {}).get(name)
+            if previous is None:
+                continue
+            for metric in ("p50_ms", "p99_ms"):
+                if metric in previous and current[metric] > previous[metric] * (1 + threshold):
+                    regressions.append(f"{section} {name} {metric}: {previous[metric]} -> {current[metric]}")
+    return regressions
+
+async def run(args):
+    await bench_seed.seed()
+    from backend.db_conn import warm_pool, dispose_engine
+    await warm_pool()
+    results = {
+        "meta": {"python": platform.python_version(), "machine": platform.machine(), "timestamp": time.time(),
+                 "iterations": args.iterations, "requests": args.requests, "concurrency": args.concurrency},
+        "micro": await micro_benchmarks(args.iterations),
+        "load": await load_test(args.requests, args.concurrency),
+        "admission": await admission_test(args.requests, args.concurrency),
+    }
+    await dispose_engine()
+    return results
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--iterations", type=int, default=50, help="Calls per micro-benchmark")
+    parser.add_argument("--requests", type=int, default=500, help="Requests per route in the load test")
+    parser.add_argument("--concurrency", type=int, default=32, help="Concurrent clients in the load test")
+    parser.add_argument("--output", type=Path, default=Path("benchmark_results.json"))
+    parser.add_argument("--baseline", type=Path, default=DEFAULT_BASELINE)
+    parser.add_argument("--threshold", type=float, default=0.2, help="Allowed slowdown vs. baseline (0.2 = 20%%)")
+    parser.add_argument("--save-baseline", action="store_true")
+    args = parser.parse_args()
+
+    results = asyncio.run(run(args))
+    args.output.write_text(json.dumps(results, indent=2))
+    print(json.dumps({section: results[section] for section in ("micro", "load", "admission")}, indent=2))
+
+    if args.save_baseline:
+        args.baseline.write_text(json.dumps(results, indent=2))
+        print(f"Baseline saved to {args.baseline}")
+    elif args.baseline.exists():
+        regressions = compare(results, json.loads(args.baseline.read_text()), args.threshold)
+        for regression in regressions:
+            print("REGRESSION", regression)
+        if regressions:
+            sys.exit(1)
+        print(f"No regressions beyond {args.threshold:.0%} of {args.baseline}")
+
+if __name__ == "__main__":
+    main()
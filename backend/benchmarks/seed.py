@@ -0,0 +1,54 @@
+'''
+Seed an embedded SQLite stand-in for the production database from "finalized data/*.csv".
+
+Must be imported before anything touches backend.db_conn, since it points DATABASE_URL at SQLite.
+'''
+
+import os
+from pathlib import Path
+
+DATA_DIR = Path(__file__).resolve().parents[2] / "finalized data"
+DEFAULT_DB = Path(__file__).resolve().parent / "bench.db"
+
+def configure(db_path: Path = DEFAULT_DB):
+    """Points the app's lazy engine at the local SQLite file."""
+    os.environ["DATABASE_URL"] = f"sqlite+aiosqlite:///{db_path}"
+    os.environ["DATABASE_SSL"] = "false"
+    os.environ.setdefault("DB_POOL_WARM", "2")
+    # The load generator is a single client, and the plain load test measures latency rather than shedding
+    os.environ.setdefault("ADMISSION_RATE", "0")
+    os.environ.setdefault("ADMISSION_MAX_WAIT", "60")
+
+async def seed(db_path: Path = DEFAULT_DB):
+    """Recreates the database: team_stats and matchups from CSV, then ratings."""
+    import pandas as pd
+    from sqlalchemy import MetaData
+    from backend.db_conn import get_engine, SessionFactory
+    from backend.models.base import Base
+    from backend.models.team_stats import TeamStats
+    import backend.models.game_result, backend.models.team_rating  # Register every table
+    import backend.scripts.init_db as init_db
+    from backend.scripts.build_ratings import build_ratings
+
+    if db_path.exists():
+        db_path.unlink()
+
+    # SQLite stores NaN as NULL, so the copy used for the stand-in relaxes NOT NULL on stat columns
+    metadata = MetaData()
+    for table in Base.metadata.sorted_tables:
+        copy = table.to_metadata(metadata)
+        for column in copy.columns:
+            if not column.primary_key:
+                column.nullable = True
+    async with get_engine().begin() as conn:
+        await conn.run_sync(metadata.create_all)
+
+    stats = pd.read_csv(DATA_DIR / "team_stats.csv").astype(object)
+    stats = stats.where(stats.notna(), None)
+    async with SessionFactory() as session:
+        session.add_all([TeamStats(**row) for row in stats.to_dict("records")])
+        await session.commit()
+
+    init_db.CSV_FILE = DATA_DIR / "matchups_1991_2024.csv"
+    await init_db.load_csv_data()
+    await build_ratings()
@@ -1,18 +1,52 @@
 from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine, async_sessionmaker
+import asyncio
 import os
 from dotenv import load_dotenv
 
-load_dotenv()
+# Created on first use, never at import, so importing the app has no side effects
+_engine = None
+_session_factory = None
 
-DATABASE_URL = os.getenv("DATABASE_URL")
-print(DATABASE_URL)
+def _env_flag(name: str, default: str):
+    return os.getenv(name, default).strip().lower() in ("1", "true", "yes")
 
-engine = create_async_engine(
-    DATABASE_URL,
-    echo=True,
-    connect_args={"ssl": True}
-)
-SessionFactory = async_sessionmaker(engine, expire_on_commit=False)
+def get_engine():
+    """Creates the engine from configuration the first time it is needed."""
+    global _engine
+    if _engine is None:
+        load_dotenv()
+        _engine = create_async_engine(
+            os.environ["DATABASE_URL"],
+            echo=_env_flag("SQL_ECHO", "false"),
+            pool_size=int(os.getenv("DB_POOL_SIZE", "5")),
+            max_overflow=int(os.getenv("DB_MAX_OVERFLOW", "10")),
+            pool_pre_ping=True,
+            connect_args={"ssl": True} if _env_flag("DATABASE_SSL", "true") else {},
+        )
+    return _engine
+
+def get_session_factory():
+    global _session_factory
+    if _session_factory is None:
+        _session_factory = async_sessionmaker(get_engine(), expire_on_commit=False)
+    return _session_factory
+
+def SessionFactory():
+    """Opens a new session (kept callable under its old name for the scripts)."""
+    return get_session_factory()()
+
+async def warm_pool(size: int = None):
+    """Opens size connections at once and returns them to the pool, so first requests skip the handshake."""
+    size = size if size is not None else int(os.getenv("DB_POOL_WARM", os.getenv("DB_POOL_SIZE", "5")))
+    engine = get_engine()
+    connections = await asyncio.gather(*[engine.connect() for _ in range(size)])
+    await asyncio.gather(*[conn.close() for conn in connections])
+
+async def dispose_engine():
+    global _engine, _session_factory
+    if _engine is not None:
+        await _engine.dispose()
+    _engine, _session_factory = None, None
 
 # Dependency to get DB session
 async def get_db() -> AsyncSession:
@@ -0,0 +1,4 @@
+from sqlalchemy.orm import declarative_base
+
+# Shared by every model so foreign keys between tables resolve in one MetaData
+Base = declarative_base()
@@ -0,0 +1,12 @@
+from sqlalchemy import Column, Integer, String
+from backend.models.base import Base
+
+class DataVersion(Base):
+    """
+    A counter per source table, bumped by a database trigger on every write to that table
+    (see scripts/track_data_versions.py). Servers poll it to drop caches built from old data.
+    """
+    __tablename__ = "data_versions"
+
+    name = Column(String, primary_key=True)  # Table name, e.g. team_stats
+    version = Column(Integer, nullable=False, default=0, server_default="0")
@@ -0,0 +1,19 @@
+from sqlalchemy import Column, Integer, String, UniqueConstraint
+from backend.models.base import Base
+
+class GameResult(Base):
+    """
+    A live tournament result recorded through the results ingestion endpoint.
+    Teams are stored in canonical (alphabetical) order so a game has exactly one row.
+    """
+    __tablename__ = "game_results"
+    __table_args__ = (UniqueConstraint("year", "teamA", "teamB", name="uq_game_results_game"),)
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    year = Column(Integer, nullable=False, index=True)
+    round_name = Column(String, nullable=False)
+    teamA = Column(String, nullable=False)
+    teamB = Column(String, nullable=False)
+    score_teamA = Column(Integer, nullable=False)
+    score_teamB = Column(Integer, nullable=False)
+    status = Column(String, nullable=False, default="in_progress", server_default="in_progress")  # in_progress | final
@@ -1,41 +1,37 @@
-from sqlalchemy import Column, Integer, String, Float
-from sqlalchemy.orm import declarative_base
-
-Base = declarative_base()
+from sqlalchemy import Column, Integer, String, ForeignKey
+from sqlalchemy.orm import aliased
+from sqlalchemy.future import select
+from backend.models.base import Base
+from backend.models.team_stats import TeamStats
+from backend.analysis.features import STAT_COLUMNS
 
 class Matchup(Base):
+    """A tournament game. Stat differences are derived from team_stats, never stored."""
     __tablename__ = "matchups"
 
     id = Column(Integer, primary_key=True, autoincrement=True)  # Auto-generated ID
-    year = Column(Integer, nullable=False)
+    year = Column(Integer, nullable=False, index=True)
     teamA = Column(String, nullable=False)
     teamB = Column(String, nullable=False)
     winner = Column(Integer, nullable=False)
-    diff_seed = Column(Integer, nullable=False)
-    diff_win_pct = Column(Float, nullable=False)
-    diff_ps_per_game = Column(Float, nullable=False)
-    diff_pa_per_game = Column(Float, nullable=False)
-    diff_srs = Column(Float, nullable=False)
-    diff_sos = Column(Float, nullable=False)
-    diff_fg_per_game = Column(Float, nullable=False)
-    diff_fga_per_game = Column(Float, nullable=False)
-    diff_fg_pct = Column(Float, nullable=False)
-    diff_fg2_per_game = Column(Float, nullable=False)
-    diff_fg2a_per_game = Column(Float, nullable=False)
-    diff_fg2_pct = Column(Float, nullable=False)
-    diff_fg3_per_game = Column(Float, nullable=False)
-    diff_fg3a_per_game = Column(Float, nullable=False)
-    diff_fg3_pct = Column(Float, nullable=False)
-    diff_ft_per_game = Column(Float, nullable=False)
-    diff_fta_per_game = Column(Float, nullable=False)
-    diff_ft_pct = Column(Float, nullable=False)
-    diff_orb_per_game = Column(Float, nullable=False)
-    diff_drb_per_game = Column(Float, nullable=False)
-    diff_trb_per_game = Column(Float, nullable=False)
-    diff_ast_per_game = Column(Float, nullable=False)
-    diff_stl_per_game = Column(Float, nullable=False)
-    diff_blk_per_game = Column(Float, nullable=False)
-    diff_tov_per_game = Column(Float, nullable=False)
-    diff_pf_per_game = Column(Float, nullable=False)
-    diff_offensive_rating = Column(Float, nullable=False)
-    diff_defensive_rating = Column(Float, nullable=False)
+    teamA_id = Column(Integer, ForeignKey("team_stats.id"), nullable=True, index=True)
+    teamB_id = Column(Integer, ForeignKey("team_stats.id"), nullable=True, index=True)
+
+
+def diff_columns(team1, team2):
+    """diff_* expressions (team1 - team2) between two TeamStats aliases."""
+    return [(getattr(team1, col) - getattr(team2, col)).label(f"diff_{col}") for col in STAT_COLUMNS]
+
+
+def matchup_diffs_query():
+    """
+    Matchups joined to both teams' stats, with the diff_* features computed in the query.
+    Acts as a live view: a correction to team_stats shows up in every matchup immediately.
+    """
+    team1, team2 = aliased(TeamStats), aliased(TeamStats)
+    return (
+        select(Matchup.id, Matchup.year, Matchup.teamA, Matchup.teamB, Matchup.winner, *diff_columns(team1, team2))
+        .outerjoin(team1, Matchup.teamA_id == team1.id)
+        .outerjoin(team2, Matchup.teamB_id == team2.id)
+        .order_by(Matchup.id)
+    )
@@ -0,0 +1,14 @@
+from sqlalchemy import Column, Integer, String, Float, UniqueConstraint
+from backend.models.base import Base
+
+class TeamRating(Base):
+    """End-of-season Elo checkpoint for every team rated so far (team is the canonical team_slug())."""
+    __tablename__ = "team_ratings"
+    __table_args__ = (UniqueConstraint("year", "team", name="uq_team_ratings_year_team"),)
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    year = Column(Integer, nullable=False, index=True)
+    team = Column(String, nullable=False)
+    pre_rating = Column(Float, nullable=False)  # Rating entering the tournament
+    rating = Column(Float, nullable=False)  # Rating after the tournament
+    games = Column(Integer, nullable=False)  # Tournament games played that year
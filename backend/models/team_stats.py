@@ -1,16 +1,14 @@
 from sqlalchemy import Column, Integer, String, Float
-from sqlalchemy.orm import declarative_base
-
-Base = declarative_base()
+from backend.models.base import Base
 
 class TeamStats(Base):
     __tablename__ = "team_stats"
 
     id = Column(Integer, primary_key=True, autoincrement=True)  
-    year = Column(Integer, nullable=False)
+    year = Column(Integer, nullable=False, index=True)
     team = Column(String, nullable=False)
     conference = Column(String, nullable=True)
-    seed = Column(Integer, nullable=True)
+    seed = Column(Integer, nullable=True, index=True)  # where=seed = 12 and year >= 2010 uses either index
     wins = Column(Integer, nullable=True)
     losses = Column(Integer, nullable=True)
     win_pct = Column(Float, nullable=False)
@@ -0,0 +1,26 @@
+'''
+Run a leave-one-season-out backtest of the matchup model and print the results as JSON
+'''
+
+import asyncio
+import json
+import time
+from backend.models.matchup import matchup_diffs_query
+from backend.db_conn import SessionFactory
+from backend.analysis.backtest import backtest
+
+async def load_matchups():
+    """Reads every historical matchup from the database."""
+    async with SessionFactory() as session:
+        result = await session.execute(matchup_diffs_query())
+        return result.all()
+
+def run_backtest():
+    matchups = asyncio.run(load_matchups())
+    start = time.perf_counter()
+    results = backtest(matchups)
+    results["summary"]["seconds"] = round(time.perf_counter() - start, 3)
+    print(json.dumps(results, indent=2))
+
+if __name__ == "__main__":
+    run_backtest()
@@ -0,0 +1,68 @@
+'''
+Populate the team_ratings table.
+
+    python -m backend.scripts.build_ratings              # replay every season
+    python -m backend.scripts.build_ratings --year 2025  # replay one season from the previous checkpoint
+'''
+
+import argparse
+import asyncio
+from sqlalchemy import delete, func
+from sqlalchemy.future import select
+from backend.models.matchup import Matchup
+from backend.models.team_stats import TeamStats
+from backend.models.team_rating import TeamRating, Base
+from backend.db_conn import get_engine, SessionFactory
+from backend.analysis.features import team_slug
+from backend.analysis.ratings import games_by_year, replay
+
+FINAL_YEAR = 2025  # Latest season with a field, even before any of its games are played
+
+async def create_tables():
+    """Creates the team_ratings table."""
+    async with get_engine().begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+
+async def load_checkpoint(session, year: int):
+    """Returns {team: rating} from the latest stored season before year."""
+    latest = await session.scalar(select(func.max(TeamRating.year)).where(TeamRating.year < year))
+    if latest is None:
+        return None, None
+    result = await session.execute(select(TeamRating.team, TeamRating.rating).where(TeamRating.year == latest))
+    return latest, dict(result.all())
+
+async def build_ratings(year: int = None):
+    """Replays every season, or only the seasons from year onward when a checkpoint exists."""
+    await create_tables()
+
+    async with SessionFactory() as session:
+        checkpoint, start_year = None, None
+        if year is not None:
+            latest, checkpoint = await load_checkpoint(session, year)
+            start_year = latest + 1 if latest is not None else None
+
+        query = select(Matchup)
+        if start_year is not None:
+            query = query.where(Matchup.year >= start_year)
+        result = await session.execute(query)
+        matchups = result.scalars().all()
+        # Games are tied to programs through their team_stats rows, not the stored names
+        slugs = {id: team_slug(team) for id, team in (await session.execute(select(TeamStats.id, TeamStats.team))).all()}
+        checkpoints = replay(games_by_year(matchups, slugs), max(FINAL_YEAR, year or 0), checkpoint, start_year)
+
+        if checkpoints:
+            await session.execute(delete(TeamRating).where(TeamRating.year >= min(checkpoints)))
+        session.add_all([
+            TeamRating(year=season, team=team, **values)
+            for season, teams in checkpoints.items()
+            for team, values in teams.items()
+        ])
+        await session.commit()
+
+    print(f"Stored ratings for {len(checkpoints)} season(s)")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--year", type=int, default=None, help="Only replay this season (and later) from the stored checkpoint")
+    args = parser.parse_args()
+    asyncio.run(build_ratings(args.year))
@@ -0,0 +1,34 @@
+'''
+One-off migration for databases created before game results had a status and a canonical team order.
+Adds the status column, drops the older of any game posted under both team orders, then stores
+every game with its teams in alphabetical order (scores swapped to match).
+'''
+
+import asyncio
+from sqlalchemy import text
+from backend.db_conn import get_engine
+
+async def add_status():
+    async with get_engine().begin() as conn:
+        await conn.execute(text("ALTER TABLE game_results ADD COLUMN IF NOT EXISTS status VARCHAR NOT NULL DEFAULT 'in_progress'"))
+
+async def canonicalize_results():
+    async with get_engine().begin() as conn:
+        await conn.execute(text('''
+            DELETE FROM game_results AS old USING game_results AS new
+            WHERE old.year = new.year AND old."teamA" = new."teamB" AND old."teamB" = new."teamA" AND old.id < new.id
+        '''))
+        # SET reads the old row, so this swaps in place
+        await conn.execute(text('''
+            UPDATE game_results
+            SET "teamA" = "teamB", "teamB" = "teamA", "score_teamA" = "score_teamB", "score_teamB" = "score_teamA"
+            WHERE lower("teamA") > lower("teamB")
+        '''))
+
+async def migrate():
+    await add_status()
+    await canonicalize_results()
+    print("game_results now has a status column and one canonical row per game")
+
+if __name__ == "__main__":
+    asyncio.run(migrate())
@@ -0,0 +1,20 @@
+'''
+One-off migration for databases created before team_stats had indexes on the columns filters use most.
+create_all only creates indexes with their table, so existing databases need this once.
+'''
+
+import asyncio
+from sqlalchemy import text
+from backend.db_conn import get_engine
+
+INDEXED_COLUMNS = ("year", "seed")
+
+async def index_team_stats():
+    async with get_engine().begin() as conn:
+        for column in INDEXED_COLUMNS:
+            await conn.execute(text(f'CREATE INDEX IF NOT EXISTS "ix_team_stats_{column}" ON team_stats ({column})'))
+        await conn.execute(text("ANALYZE team_stats"))
+    print(f"team_stats indexed on {', '.join(INDEXED_COLUMNS)}")
+
+if __name__ == "__main__":
+    asyncio.run(index_team_stats())
@@ -1,30 +1,73 @@
 '''
-Just run this once to populate the matchups table
+Just run this once to populate the matchups table.
+
+team_stats must be loaded first: each game is stored with the team_stats ids of both teams and
+its diffs are derived from those rows, so the load aborts if any game has no stats for a team.
 '''
 
 import pandas as pd
 import sys
 import asyncio
 from sqlalchemy.ext.asyncio import AsyncSession
-from backend.models.matchup import Matchup, Base
-from backend.db_conn import engine, SessionFactory
+from sqlalchemy.future import select
+from backend.models.base import Base
+from backend.models.matchup import Matchup
+from backend.models.team_stats import TeamStats
+from backend.models.game_result import GameResult  # Registers game_results for create_all
+from backend.models.data_version import DataVersion  # Registers data_versions for create_all
+from backend.db_conn import get_engine, SessionFactory
+from backend.analysis.features import team_key
 
-CSV_FILE = "../fixed_matchups.csv"  # Path to your CSV file
+CSV_FILE = "../finalized data/matchups_1991_2024.csv"  # Path to your CSV file
 
 async def create_tables():
-    """Creates the matchups table."""
-    async with engine.begin() as conn:
+    """Creates the matchups and game_results tables."""
+    async with get_engine().begin() as conn:
         await conn.run_sync(Base.metadata.create_all)
 
-async def load_csv_data():
-    """Loads data from CSV into the matchups table."""
-    df = pd.read_csv(CSV_FILE)
+async def team_index(session):
+    """Maps (year, cleaned team name) to [(team_stats.id, srs)]; a few cleaned names (e.g. Miami) are shared."""
+    result = await session.execute(select(TeamStats.id, TeamStats.year, TeamStats.team, TeamStats.srs))
+    index = {}
+    for id, year, team, srs in result.all():
+        index.setdefault((year, team_key(team)), []).append((id, srs))
+    return index
+
+def match_ids(index, year, teamA, teamB, diff_srs=None):
+    """Returns (teamA_id, teamB_id) for a game, using the old stored diff_srs to break name collisions."""
+    candidates = [
+        (a, b, srs_a, srs_b)
+        for a, srs_a in index.get((year, team_key(teamA)), [(None, None)])
+        for b, srs_b in index.get((year, team_key(teamB)), [(None, None)])
+    ]
+    if len(candidates) > 1 and diff_srs == diff_srs and diff_srs is not None:  # Skip NaN
+        candidates.sort(key=lambda c: abs((c[2] or 0) - (c[3] or 0) - diff_srs))
+    return candidates[0][:2]
 
-    matchups = [Matchup(**row.to_dict()) for _, row in df.iterrows()]
+def check_matches(games, ids, max_unmatched: int = 0):
+    """
+    Raises when more than max_unmatched games lack a team_stats row for either team; their
+    diffs would silently come out NULL. An empty team_stats table fails every game.
+    """
+    unmatched = [game for game, pair in zip(games, ids) if None in pair]
+    if len(unmatched) > max_unmatched:
+        examples = ", ".join(f"{year} {teamA} vs {teamB}" for year, teamA, teamB in unmatched[:10])
+        hint = " (is team_stats loaded?)" if len(unmatched) == len(games) else ""
+        raise RuntimeError(f"{len(unmatched)} of {len(games)} games have no team_stats row for a team{hint}: {examples}")
+
+async def load_csv_data():
+    """Loads games from CSV into the matchups table; diffs come from team_stats, so only ids are stored."""
+    df = pd.read_csv(CSV_FILE, usecols=["year", "teamA", "teamB", "winner", "diff_srs"])
 
     async with SessionFactory() as session:
-        async with session.begin():
-            session.add_all(matchups)
+        index = await team_index(session)
+        games = list(zip(df["year"], df["teamA"], df["teamB"]))
+        ids = [match_ids(index, row.year, row.teamA, row.teamB, row.diff_srs) for row in df.itertuples(index=False)]
+        check_matches(games, ids)
+        session.add_all([
+            Matchup(year=int(row.year), teamA=row.teamA, teamB=row.teamB, winner=int(row.winner), teamA_id=teamA_id, teamB_id=teamB_id)
+            for row, (teamA_id, teamB_id) in zip(df.itertuples(index=False), ids)
+        ])
         await session.commit()
 
 async def initialize_database():
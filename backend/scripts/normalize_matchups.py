@@ -0,0 +1,47 @@
+'''
+One-off migration for databases created before matchups referenced team_stats.
+Adds the teamA_id/teamB_id foreign keys, backfills them, then drops the stored diff_* columns.
+'''
+
+import asyncio
+from sqlalchemy import text, update, column
+from sqlalchemy.future import select
+from backend.models.matchup import Matchup
+from backend.db_conn import get_engine, SessionFactory
+from backend.analysis.features import DIFF_COLUMNS
+from backend.scripts.init_db import team_index, match_ids, check_matches
+
+async def add_foreign_keys():
+    async with get_engine().begin() as conn:
+        for column in ("teamA_id", "teamB_id"):
+            await conn.execute(text(f'ALTER TABLE matchups ADD COLUMN IF NOT EXISTS "{column}" INTEGER REFERENCES team_stats (id)'))
+            await conn.execute(text(f'CREATE INDEX IF NOT EXISTS "ix_matchups_{column}" ON matchups ("{column}")'))
+        await conn.execute(text('CREATE INDEX IF NOT EXISTS "ix_matchups_year" ON matchups (year)'))
+
+async def backfill_foreign_keys():
+    async with SessionFactory() as session:
+        index = await team_index(session)
+        # diff_srs is still present at this point and settles games between teams sharing a cleaned name
+        result = await session.execute(select(Matchup.id, Matchup.year, Matchup.teamA, Matchup.teamB, column("diff_srs")))
+        rows = result.all()
+        ids = [match_ids(index, year, teamA, teamB, diff_srs) for _, year, teamA, teamB, diff_srs in rows]
+        # Checked before anything is written: the stored diffs are dropped next
+        check_matches([(year, teamA, teamB) for _, year, teamA, teamB, _ in rows], ids)
+        # ORM bulk UPDATE by primary key: one executemany instead of a round trip per game
+        updates = [{"id": row[0], "teamA_id": teamA_id, "teamB_id": teamB_id} for row, (teamA_id, teamB_id) in zip(rows, ids)]
+        await session.execute(update(Matchup), updates)
+        await session.commit()
+
+async def drop_stored_diffs():
+    async with get_engine().begin() as conn:
+        for column in DIFF_COLUMNS:
+            await conn.execute(text(f'ALTER TABLE matchups DROP COLUMN IF EXISTS "{column}"'))
+
+async def normalize_matchups():
+    await add_foreign_keys()
+    await backfill_foreign_keys()
+    await drop_stored_diffs()
+    print("matchups now references team_stats; diff_* columns dropped")
+
+if __name__ == "__main__":
+    asyncio.run(normalize_matchups())
@@ -0,0 +1,45 @@
+'''
+One-off migration that makes writes to team_stats visible to running servers.
+Creates data_versions and a statement-level trigger that bumps the team_stats row on every
+INSERT, UPDATE, DELETE or TRUNCATE, whoever makes the write (scripts, psql, the pipeline).
+Servers poll the counter and drop their cached bodies, z-score moments and team index.
+'''
+
+import asyncio
+from sqlalchemy import text
+from backend.db_conn import get_engine
+from backend.models.data_version import DataVersion
+
+TRACKED_TABLES = ("team_stats",)
+
+async def create_versions():
+    async with get_engine().begin() as conn:
+        await conn.run_sync(DataVersion.__table__.create, checkfirst=True)
+        for table in TRACKED_TABLES:
+            await conn.execute(text("INSERT INTO data_versions (name, version) VALUES (:name, 0) ON CONFLICT (name) DO NOTHING"), {"name": table})
+
+async def create_triggers():
+    async with get_engine().begin() as conn:
+        await conn.execute(text('''
+            CREATE OR REPLACE FUNCTION bump_data_version() RETURNS trigger AS $$
+            BEGIN
+                UPDATE data_versions SET version = version + 1 WHERE name = TG_TABLE_NAME;
+                RETURN NULL;
+            END;
+            $$ LANGUAGE plpgsql
+        '''))
+        for table in TRACKED_TABLES:
+            await conn.execute(text(f"DROP TRIGGER IF EXISTS {table}_data_version ON {table}"))
+            await conn.execute(text(f'''
+                CREATE TRIGGER {table}_data_version
+                AFTER INSERT OR UPDATE OR DELETE OR TRUNCATE ON {table}
+                FOR EACH STATEMENT EXECUTE FUNCTION bump_data_version()
+            '''))
+
+async def track_data_versions():
+    await create_versions()
+    await create_triggers()
+    print(f"writes to {', '.join(TRACKED_TABLES)} now bump data_versions")
+
+if __name__ == "__main__":
+    asyncio.run(track_data_versions())
@@ -1,11 +1,46 @@
-from fastapi import FastAPI
+from contextlib import asynccontextmanager
+import asyncio
+from dotenv import load_dotenv
+from fastapi import FastAPI, Response
+from backend.db_conn import dispose_engine
+from backend.api.singleflight import singleflight
+from backend.api.admission import admission, AdmissionMiddleware
+from backend.api.data_version import data_version
+from backend.api.warmup import warm_up
+from backend.analysis.bracket import start_executor, shutdown_executor
 from backend.api.endpoints.matchups import router as matchups_router
 from backend.api.endpoints.team_stats import router as team_stats_router  # Import team_stats router
+from backend.api.endpoints.bracket import router as bracket_router
+from backend.api.endpoints.ratings import router as ratings_router
+from backend.api.endpoints.live import router as live_router
+from backend.api.endpoints.teams import router as teams_router
 
-app = FastAPI()
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """
+    Warm-up runs in the background: the process is live at once and ready once warm. Owns the
+    simulation worker pool and the team_stats version watcher that drops stale caches.
+    """
+    load_dotenv()
+    admission.configure()
+    start_executor()
+    app.state.ready = False
+    tasks = [asyncio.create_task(warm_up(app)), asyncio.create_task(data_version.watch())]
+    yield
+    for task in tasks:
+        task.cancel()
+    shutdown_executor()
+    await dispose_engine()
+
+app = FastAPI(lifespan=lifespan)
+app.add_middleware(AdmissionMiddleware)
 
 app.include_router(matchups_router, prefix="/matchups", tags=["matchups"])
 app.include_router(team_stats_router, prefix="/stats", tags=["team stats"])  # Register team_stats router
+app.include_router(bracket_router, prefix="/bracket", tags=["bracket"])
+app.include_router(ratings_router, prefix="/ratings", tags=["ratings"])
+app.include_router(live_router, prefix="/live", tags=["live"])
+app.include_router(teams_router, prefix="/teams", tags=["teams"])
 
 # Include API routes
 # use include_router on all routes we are using
@@ -13,3 +48,16 @@ app.include_router(team_stats_router, prefix="/stats", tags=["team stats"])  # R
 @app.get("/")
 async def root():
     return "API running"
+
+@app.get("/ready")
+async def ready(response: Response):
+    """Readiness probe: 503 until the pool is warm and hot queries are primed."""
+    if not getattr(app.state, "ready", False):
+        response.status_code = 503
+        return {"ready": False}
+    return {"ready": True}
+
+@app.get("/metrics")
+async def metrics():
+    """Process-local counters for request coalescing and admission control (queue depths, shed requests)."""
+    return {"singleflight": singleflight.stats(), "admission": admission.stats()}
@@ -0,0 +1,54 @@
+'''
+Tests for the where/sort/limit filter parser and its cache keys.
+
+    python -m pytest backend/tests
+'''
+
+import math
+import pytest
+from backend.api.filters import FilterError, QueryFilter, numeric_columns, parse_filter
+from backend.models.team_stats import TeamStats
+
+COLUMNS = numeric_columns(TeamStats)
+
+
+def test_parse_precedence_and_parens():
+    assert parse_filter("seed = 12 and srs > 10 or year >= 2010", COLUMNS) == (
+        "or", [("and", [("cmp", "seed", "=", 12.0), ("cmp", "srs", ">", 10.0)]), ("cmp", "year", ">=", 2010.0)])
+    assert parse_filter("seed = 12 and (srs > 10 or year >= 2010)", COLUMNS) == (
+        "and", [("cmp", "seed", "=", 12.0), ("or", [("cmp", "srs", ">", 10.0), ("cmp", "year", ">=", 2010.0)])])
+
+
+@pytest.mark.parametrize("text", ["team = 1", "seed =", "seed = 12 and", "(seed = 12", "seed = 12)", "seed ~ 12", "x" * 600])
+def test_parse_errors(text):
+    with pytest.raises(FilterError):
+        parse_filter(text, COLUMNS)
+
+
+def test_equivalent_filters_share_a_key():
+    assert QueryFilter("seed = 12", columns=COLUMNS) == QueryFilter("seed == 12.0", columns=COLUMNS)
+    assert QueryFilter("srs > 1e1", columns=COLUMNS).key == QueryFilter("srs > 10", columns=COLUMNS).key
+
+
+@pytest.mark.parametrize("a, b", [
+    ("srs > 10.1199999", "srs > 10.1200001"),
+    ("wins > 1234567", "wins > 1234568"),
+    ("srs > 0.1", "srs > 0.10000000000000002"),
+])
+def test_distinct_values_have_distinct_keys(a, b):
+    first, second = QueryFilter(a, columns=COLUMNS), QueryFilter(b, columns=COLUMNS)
+    assert first != second
+    assert first.key != second.key
+
+
+def test_key_round_trips_value():
+    query = QueryFilter("srs > 10.1200001", columns=COLUMNS)
+    assert float(query.key[0].split()[-1]) == query.tree[3]
+
+
+def test_apply_rows_matches_sql_semantics():
+    rows = [{"srs": 10.12, "seed": 1}, {"srs": 10.1200001, "seed": None}, {"srs": math.nan, "seed": 12}, {"srs": 11.0, "seed": 12}]
+    query = QueryFilter("srs > 10.12", sort="-srs", columns=COLUMNS)
+    assert query.apply_rows(rows) == [rows[3], rows[1]]
+    # Comparisons against missing values are false, including !=
+    assert QueryFilter("seed != 1", columns=COLUMNS).apply_rows(rows) == [rows[2], rows[3]]
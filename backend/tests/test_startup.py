@@ -0,0 +1,77 @@
+'''
+Cold-start budget: importing the app must be fast and side-effect free, and warm-up must
+fill the hot caches within budget. Warm-up runs against a SQLite copy seeded from "finalized data".
+
+    python -m pytest backend/tests
+'''
+
+import asyncio
+import os
+import subprocess
+import sys
+import time
+from types import SimpleNamespace
+import pytest
+from backend.benchmarks import seed
+
+IMPORT_BUDGET_SECONDS = float(os.getenv("IMPORT_BUDGET_SECONDS", "2.0"))
+WARMUP_BUDGET_SECONDS = float(os.getenv("WARMUP_BUDGET_SECONDS", "5.0"))
+
+IMPORT_PROBE = """
+import time
+start = time.perf_counter()
+import backend.server
+import backend.db_conn
+elapsed = time.perf_counter() - start
+assert backend.db_conn._engine is None, "engine created at import"
+print(elapsed)
+"""
+
+
+def test_import_is_fast_and_side_effect_free():
+    # A fresh interpreter, so nothing imported by other tests counts towards the budget
+    env = {**os.environ, "DATABASE_URL": "postgresql+asyncpg://probe"}
+    result = subprocess.run([sys.executable, "-c", IMPORT_PROBE], capture_output=True, text=True, env=env)
+    assert result.returncode == 0, result.stderr
+    lines = result.stdout.strip().splitlines()
+    assert len(lines) == 1, f"import wrote to stdout: {lines[:-1]}"
+    assert float(lines[0]) <= IMPORT_BUDGET_SECONDS
+
+
+@pytest.fixture
+def seeded_db(tmp_path, monkeypatch):
+    # seed.configure() sets these; deleting them first makes monkeypatch restore the originals
+    for name in ("DATABASE_URL", "DATABASE_SSL", "DB_POOL_WARM", "ADMISSION_RATE", "ADMISSION_MAX_WAIT"):
+        monkeypatch.delenv(name, raising=False)
+    from backend.db_conn import dispose_engine
+
+    async def build(db_path):
+        await seed.seed(db_path)
+        await dispose_engine()
+
+    db_path = tmp_path / "startup.db"
+    seed.configure(db_path)
+    asyncio.run(build(db_path))
+    return db_path
+
+
+def test_warm_up_fills_caches_within_budget(seeded_db):
+    from backend.api import encoding
+    from backend.api.endpoints.teams import team_index
+    from backend.api.warmup import warm_up
+    from backend.db_conn import dispose_engine
+
+    async def measure():
+        app = SimpleNamespace(state=SimpleNamespace(ready=False))
+        start = time.perf_counter()
+        try:
+            await asyncio.wait_for(warm_up(app), WARMUP_BUDGET_SECONDS * 4)
+        finally:
+            await dispose_engine()
+        return app, time.perf_counter() - start
+
+    app, elapsed = asyncio.run(measure())
+    assert app.state.ready
+    assert elapsed <= WARMUP_BUDGET_SECONDS
+    assert {entry[1][0] for entry in encoding._cache} >= {"matchups", "team_stats"}
+    assert team_index.find("Duke") is not None
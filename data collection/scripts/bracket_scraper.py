@@ -0,0 +1,275 @@
+'''
+Structured tournament brackets from Wikipedia.
+
+    python bracket_scraper.py                                 # 1991-2024 -> ../data/bracket_games.parquet
+    python bracket_scraper.py --years 2024 2025
+    python bracket_scraper.py --offline --cache-dir fixtures  # parse saved pages only, no network
+
+Pages are fetched as wikitext (action=raw) over one pooled session, several at a time, and saved
+under ../data/wikipedia/<year>.wikitext; saved pages are reused, so the same directory doubles as
+offline fixtures. Parsing runs in a process pool, one pass per page: every {{NTeamBracket}}
+template becomes games with round, region, seeds, teams and scores.
+'''
+
+import argparse
+import math
+import re
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from pathlib import Path
+import pandas as pd
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+DATA_DIR = Path(__file__).resolve().parent.parent / "data"
+DEFAULT_CACHE = DATA_DIR / "wikipedia"
+DEFAULT_YEARS = [year for year in range(1991, 2025) if year != 2020]  # No 2020 tournament
+WIKITEXT_URL = "https://en.wikipedia.org/w/index.php?title={year}_NCAA_Division_I_men%27s_basketball_tournament&action=raw"
+USER_AGENT = "march-madness-data bracket scraper (python-requests)"
+TIMEOUT = 20
+
+ROUND_NAMES = ["Round of 64", "Round of 32", "Sweet 16", "Elite 8", "Final Four", "Championship"]
+GAME_COLUMNS = ["year", "round", "round_name", "region", "seed_teamA", "teamA", "score_teamA",
+                "seed_teamB", "teamB", "score_teamB", "overtimes", "winner"]
+
+HEADING = re.compile(r"^(={2,6})\s*(.+?)\s*\1\s*$", re.M)
+BRACKET = re.compile(r"\{\{\s*(\d+)TeamBracket", re.I)
+PARAM = re.compile(r"^RD(\d+)-(seed|team|score)0*(\d+)$", re.I)
+
+
+def make_session(workers: int = 8):
+    """One session for every page: pooled keep-alive connections, retries with backoff on 429/5xx."""
+    retry = Retry(total=4, backoff_factor=1, status_forcelist=(429, 500, 502, 503, 504), respect_retry_after_header=True)
+    session = requests.Session()
+    session.mount("https://", HTTPAdapter(pool_maxsize=workers, max_retries=retry))
+    session.headers.update({"User-Agent": USER_AGENT})
+    return session
+
+
+def fetch_page(year, session, cache_dir: Path = DEFAULT_CACHE, offline: bool = False, refresh: bool = False):
+    """A year's wikitext, from the cache when saved there, else from Wikipedia (then saved)."""
+    path = Path(cache_dir) / f"{year}.wikitext"
+    if path.exists() and not refresh:
+        return path.read_text(encoding="utf-8")
+    if offline:
+        raise FileNotFoundError(f"no saved page for {year} in {cache_dir}")
+    response = session.get(WIKITEXT_URL.format(year=year), timeout=TIMEOUT)
+    response.raise_for_status()
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(response.text, encoding="utf-8")
+    return response.text
+
+
+def template_body(text: str, start: int):
+    """The text of the template opening at start, up to its matching '}}'."""
+    depth, i = 0, start
+    while i < len(text) - 1:
+        pair = text[i:i + 2]
+        if pair == "{{":
+            depth += 1
+            i += 2
+        elif pair == "}}":
+            depth -= 1
+            i += 2
+            if depth == 0:
+                return text[start + 2:i - 2]
+        else:
+            i += 1
+    return text[start + 2:]
+
+
+def split_params(body: str):
+    """Top-level 'name=value' parameters of a template body (ignores '|' inside links and templates)."""
+    params, depth, current = {}, 0, []
+    parts = []
+    i = 0
+    while i < len(body):
+        pair = body[i:i + 2]
+        if pair in ("{{", "[["):
+            depth += 1
+            current.append(pair)
+            i += 2
+        elif pair in ("}}", "]]"):
+            depth -= 1
+            current.append(pair)
+            i += 2
+        elif body[i] == "|" and depth == 0:
+            parts.append("".join(current))
+            current = []
+            i += 1
+        else:
+            current.append(body[i])
+            i += 1
+    parts.append("".join(current))
+    for part in parts[1:]:
+        name, sep, value = part.partition("=")
+        if sep:
+            params[name.strip()] = value.strip()
+    return params
+
+
+def clean(value: str):
+    """Plain text of a wikitext value: links, bold, tags, refs and simple templates removed."""
+    value = re.sub(r"<ref[^>]*/>|<ref.*?</ref>", "", value, flags=re.S)
+    value = re.sub(r"\{\{\s*(?:nowrap|small|nobold)\s*\|([^{}]*)\}\}", r"\1", value, flags=re.I)
+    value = re.sub(r"\{\{[^{}]*\}\}", "", value)
+    value = re.sub(r"<[^>]+>", " ", value)
+    value = re.sub(r"\[\[(?:[^|\]]*\|)?([^\]]*)\]\]", r"\1", value)
+    value = value.replace("'''", "").replace("''", "").replace("&nbsp;", " ")
+    return " ".join(value.split())
+
+
+def parse_score(value: str):
+    """'72 OT' -> (72, 1), '80 2OT' -> (80, 2), '' -> (None, 0)."""
+    text = clean(value)
+    score = re.match(r"\d+", text)
+    overtime = re.search(r"\b(\d?)OT\b", text)
+    return (int(score.group()) if score else None), (int(overtime.group(1) or 1) if overtime else 0)
+
+
+def parse_seed(value: str):
+    """'16' -> 16; Final Four slots are labelled by region, 'MW1' -> 1."""
+    seed = re.search(r"\d+", clean(value))
+    return int(seed.group()) if seed else None
+
+
+def parse_team(value: str):
+    team = clean(value)
+    team = re.sub(r"\(vacated.*$", "", team, flags=re.I)
+    return team.rstrip("*† ").strip()
+
+
+def region_name(heading: str):
+    """'East Regional – Boston, Massachusetts' -> 'East'; 'Final Four – Phoenix' -> 'Final Four'."""
+    return re.split(r"\s+regional|\s+[–—-]\s+", heading, maxsplit=1, flags=re.I)[0].strip()
+
+
+def parse_bracket(wikitext: str, year: int):
+    """Every game in the page's bracket templates, in one pass over the text."""
+    headings = [(m.start(), m.group(2)) for m in HEADING.finditer(wikitext)]
+    games = []
+    h = 0
+    for match in BRACKET.finditer(wikitext):
+        while h < len(headings) and headings[h][0] < match.start():
+            h += 1
+        heading = clean(headings[h - 1][1]) if h else ""
+        n_teams = int(match.group(1))
+        # Play-in brackets (First Four / opening round) are not part of the 64-team field
+        if n_teams not in (2, 4, 8, 16, 32, 64) or re.search(r"first four|opening round|play-in", heading, re.I):
+            continue
+        # Regional and full brackets start at the round of 64; smaller ones end at the championship
+        offset = 0 if n_teams >= 16 else 6 - int(math.log2(n_teams))
+        region = None if offset >= 4 else region_name(heading)
+
+        slots = {}
+        for name, value in split_params(template_body(wikitext, match.start())).items():
+            key = PARAM.match(name)
+            if key:
+                rd, field, index = int(key.group(1)), key.group(2).lower(), int(key.group(3))
+                slots.setdefault((rd, index), {})[field] = value
+
+        for (rd, index), top in sorted(slots.items()):
+            bottom = slots.get((rd, index + 1))
+            if index % 2 == 0 or bottom is None or rd + offset > len(ROUND_NAMES):
+                continue
+            teamA, teamB = parse_team(top.get("team", "")), parse_team(bottom.get("team", ""))
+            if not teamA or not teamB:
+                continue
+            score_teamA, ot_teamA = parse_score(top.get("score", ""))
+            score_teamB, ot_teamB = parse_score(bottom.get("score", ""))
+            played = score_teamA is not None and score_teamB is not None
+            games.append({
+                "year": year,
+                "round": rd + offset,
+                "round_name": ROUND_NAMES[rd + offset - 1],
+                "region": region,
+                "seed_teamA": parse_seed(top.get("seed", "")),
+                "teamA": teamA,
+                "score_teamA": score_teamA,
+                "seed_teamB": parse_seed(bottom.get("seed", "")),
+                "teamB": teamB,
+                "score_teamB": score_teamB,
+                "overtimes": max(ot_teamA, ot_teamB),
+                "winner": (1 if score_teamA > score_teamB else 0) if played else None,
+            })
+    return games
+
+
+def games_frame(games):
+    """Games as a DataFrame with nullable integer seeds, scores and winner."""
+    integers = ["seed_teamA", "score_teamA", "seed_teamB", "score_teamB", "winner"]
+    return pd.DataFrame(games, columns=GAME_COLUMNS).astype({col: "Int64" for col in integers})
+
+
+def scrape_year(year, session, cache_dir: Path = DEFAULT_CACHE, offline: bool = False, refresh: bool = False):
+    """Games for one tournament as a DataFrame (fetches the page unless it is already saved)."""
+    return games_frame(parse_bracket(fetch_page(year, session, cache_dir, offline, refresh), year))
+
+
+def scrape_brackets(years, cache_dir: Path = DEFAULT_CACHE, workers: int = 8, offline: bool = False, refresh: bool = False):
+    """
+    Fetches pages concurrently on a shared session and parses each one in a process pool as soon
+    as it arrives. Years whose page cannot be fetched are reported and skipped.
+    """
+    session = make_session(workers)
+
+    def fetch(year):
+        try:
+            return year, fetch_page(year, session, cache_dir, offline, refresh)
+        except (requests.RequestException, FileNotFoundError) as e:
+            print(f"Skipping {year}: {e}")
+            return year, None
+
+    with ThreadPoolExecutor(max_workers=workers) as fetchers, ProcessPoolExecutor() as parsers:
+        parsed = [(year, parsers.submit(parse_bracket, text, year)) for year, text in fetchers.map(fetch, years) if text is not None]
+        games = []
+        for year, future in parsed:
+            year_games = future.result()
+            print(f"{year}: {len(year_games)} games")
+            games.extend(year_games)
+    return games_frame(games)
+
+
+def games_to_matchups(games, team_stats, clean_name):
+    """
+    Matchup rows with diff_* features, joining each bracket game to both teams' stats by exact
+    (year, cleaned name), in place of fuzzy-matching Sports-Reference win lists.
+    """
+    skip = {"team", "year", "conference", "ncaa_wins", "ncaa_loss", "wins", "losses"}
+    stat_columns = [col for col in team_stats.columns if col not in skip]
+    stats = team_stats.assign(key=team_stats["team"].map(clean_name)).drop_duplicates(["year", "key"]).set_index(["year", "key"])[stat_columns]
+
+    games = games[games["winner"].notna()].assign(keyA=games["teamA"].map(clean_name), keyB=games["teamB"].map(clean_name))
+    a = stats.reindex(pd.MultiIndex.from_arrays([games["year"], games["keyA"]])).to_numpy(dtype=float)
+    b = stats.reindex(pd.MultiIndex.from_arrays([games["year"], games["keyB"]])).to_numpy(dtype=float)
+
+    matched = ~(pd.isna(a).all(axis=1) | pd.isna(b).all(axis=1))
+    for row in games[~matched].itertuples():
+        print(f"No stats for {row.teamA} vs {row.teamB} ({row.year})")
+
+    matchups = pd.DataFrame({
+        "year": games["year"].to_numpy(),
+        "teamA": games["keyA"].to_numpy(),
+        "teamB": games["keyB"].to_numpy(),
+        "winner": games["winner"].astype(int).to_numpy(),
+    })
+    diffs = pd.DataFrame((a - b).round(3), columns=[f"diff_{col}" for col in stat_columns])
+    return pd.concat([matchups, diffs], axis=1)[matched].reset_index(drop=True)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--years", type=int, nargs="+", default=DEFAULT_YEARS)
+    parser.add_argument("--cache-dir", type=Path, default=DEFAULT_CACHE, help="Saved pages (and offline fixtures)")
+    parser.add_argument("--workers", type=int, default=8, help="Concurrent page fetches")
+    parser.add_argument("--offline", action="store_true", help="Only parse saved pages")
+    parser.add_argument("--refresh", action="store_true", help="Re-fetch pages even if saved")
+    parser.add_argument("--output", type=Path, default=DATA_DIR / "bracket_games.parquet")
+    args = parser.parse_args()
+
+    games = scrape_brackets(args.years, args.cache_dir, args.workers, args.offline, args.refresh)
+    games.to_parquet(args.output, index=False)
+    print(f"{len(games)} games saved to {args.output}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,268 @@
+'''
+Incremental runner for the scrape_tools pipeline.
+
+    python pipeline.py                          # bring every stage up to date (1991-2024 on a fresh run)
+    python pipeline.py --years 2025             # add a season: only its partitions and the global stages run
+    python pipeline.py --bootstrap              # fill source partitions from the CSVs and saved pages in ../data instead of scraping
+    python pipeline.py --refresh sports_reference --years 2024   # re-scrape a source partition
+
+Stages are partitioned by year (or global) and write one Parquet file per partition under
+../data/pipeline/<stage>/. The manifest records, per partition, a hash of its inputs (stage code,
+upstream output hashes, input files) and a hash of its output. A partition reruns only when its
+input hash changes; if it reproduces the same output, nothing downstream reruns. A partition that
+fails is recorded with a retry time and skipped until then (or until it is refreshed).
+'''
+
+import argparse
+import hashlib
+import inspect
+import json
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+import pandas as pd
+import bracket_scraper
+import scrape_tools
+
+DATA_DIR = Path(__file__).resolve().parent.parent / "data"
+DEFAULT_OUT = DATA_DIR / "pipeline"
+DEFAULT_YEARS = [year for year in range(1991, 2025) if year != 2020]  # No 2020 tournament
+ALL = "all"  # Partition key of global stages
+RETRY_SECONDS = 6 * 60 * 60  # How long a failed partition is left alone before it is tried again
+
+class Stage:
+    """One pipeline step: compute(**inputs) -> DataFrame, run per year or once over every year."""
+
+    def __init__(self, name, compute, deps=(), files=None, per_year=True, source=False,
+                 bootstrap=None, code=(), max_workers=None):
+        self.name = name
+        self.compute = compute
+        self.deps = deps              # Upstream stage names; per-year deps of a global stage arrive concatenated
+        self.files = files or {}      # Input name -> file path, hashed by content
+        self.per_year = per_year
+        self.source = source          # Fetches external data: reruns only when missing or refreshed
+        self.bootstrap = bootstrap    # CSV that can stand in for a source stage's output, or year -> DataFrame without network
+        self.max_workers = max_workers
+        # Source stages are not invalidated by code edits, or every edit would trigger a full re-scrape
+        self.code_hash = "" if source else digest(*(inspect.getsource(fn) for fn in (compute, *code)))
+
+def digest(*parts):
+    h = hashlib.blake2b(digest_size=16)
+    for part in parts:
+        h.update(part if isinstance(part, bytes) else str(part).encode())
+        h.update(b"\0")
+    return h.hexdigest()
+
+def frame_hash(df):
+    """Content hash of a DataFrame, independent of the file format it was stored in."""
+    return digest(list(df.columns), pd.util.hash_pandas_object(df, index=False).values.tobytes())
+
+
+# Stage computations: thin wrappers over scrape_tools
+
+_sessions = {}
+_sessions_lock = threading.Lock()
+
+def shared_session(make_session):
+    """One session per factory for the whole run, so every partition reuses pooled connections."""
+    with _sessions_lock:
+        if make_session not in _sessions:
+            _sessions[make_session] = make_session()
+        return _sessions[make_session]
+
+def seeds(year):
+    teams = scrape_tools.scrape_wikipedia_year(year, shared_session(scrape_tools.make_session))
+    return pd.DataFrame(teams, columns=["seed", "team", "conference", "wins", "losses", "year"])
+
+def unique_teams(seeds):
+    return pd.DataFrame({"team": sorted(seeds["team"].unique())})
+
+def team_mapping(seeds, curated):
+    """Sports-Reference slug for each team: the curated mapping, else the formatted name."""
+    curated = dict(zip(curated["unique_ncaa_team"], curated["lower_ncaa_team"]))
+    teams = sorted(seeds["team"].unique())
+    return pd.DataFrame({"team": teams, "slug": [curated.get(team, scrape_tools.format_team_name(team)) for team in teams]})
+
+def sports_reference(seeds, team_mapping):
+    session = scrape_tools.make_session()
+    mapping = dict(zip(team_mapping["team"], team_mapping["slug"]))
+    all_stats = []
+    for i, row in enumerate(seeds.itertuples()):
+        if i:
+            time.sleep(random.uniform(5, 10))  # Avoid getting blocked
+        stats = scrape_tools.scrape_team_stats(row.team, row.year, mapping, session)
+        if stats:
+            all_stats.append(stats)
+    return pd.DataFrame(all_stats)
+
+def bracket_games(year):
+    return bracket_scraper.scrape_year(year, shared_session(bracket_scraper.make_session))
+
+def saved_bracket_games(year):
+    """Bootstrap: parse the saved page only; a missing page fails instead of fetching."""
+    return bracket_scraper.scrape_year(year, None, offline=True)
+
+def team_stats(seeds, sports_reference):
+    return scrape_tools.merge_team_stats(seeds, sports_reference)
+
+def matchups(team_stats, bracket_games):
+    """Exact joins on the season's bracket when it was parsed; fuzzy win-list matching otherwise."""
+    if len(bracket_games):
+        return bracket_scraper.games_to_matchups(bracket_games, team_stats, scrape_tools.clean_team_name)
+    return scrape_tools.build_matchups(team_stats)
+
+def combined(**inputs):
+    (frame,) = inputs.values()
+    return frame
+
+STAGES = [
+    Stage("seeds", seeds, source=True, bootstrap="march_madness_1991_2024_cleaned.csv"),
+    Stage("unique_teams", unique_teams, deps=["seeds"], per_year=False),
+    Stage("team_mapping", team_mapping, deps=["seeds"], files={"curated": DATA_DIR / "mapped_ncaa_teams.csv"}),
+    Stage("sports_reference", sports_reference, deps=["seeds", "team_mapping"], source=True,
+          bootstrap="march_madness_sports_reference.csv", max_workers=2),
+    Stage("bracket_games", bracket_games, source=True, bootstrap=saved_bracket_games),
+    Stage("team_stats", team_stats, deps=["seeds", "sports_reference"], code=[scrape_tools.merge_team_stats]),
+    Stage("matchups", matchups, deps=["team_stats", "bracket_games"],
+          code=[scrape_tools.build_matchups, scrape_tools.clean_team_name, bracket_scraper.games_to_matchups]),
+    Stage("all_team_stats", combined, deps=["team_stats"], per_year=False),
+    Stage("all_matchups", combined, deps=["matchups"], per_year=False),
+    Stage("all_bracket_games", combined, deps=["bracket_games"], per_year=False),
+]
+
+class Pipeline:
+    """Runs stages in order, recomputing only partitions whose input hash changed."""
+
+    def __init__(self, out: Path, workers: int = 8, bootstrap: bool = False, refresh=()):
+        self.out = out
+        self.workers = workers
+        self.use_bootstrap = bootstrap
+        self.refresh = set(refresh)  # (stage, partition) pairs to recompute regardless of hashes
+        self.manifest_path = out / "manifest.json"
+        self.manifest = json.loads(self.manifest_path.read_text()) if self.manifest_path.exists() else {}
+        self.stages = {stage.name: stage for stage in STAGES}
+
+    def path(self, stage, partition):
+        if partition == ALL:
+            return self.out / f"{stage.name}.parquet"
+        return self.out / stage.name / f"year={partition}.parquet"
+
+    def load(self, stage_name, partition):
+        stage = self.stages[stage_name]
+        if stage.per_year and partition == ALL:
+            recorded = self.manifest.get(stage_name, {})
+            frames = [pd.read_parquet(self.path(stage, p)) for p in sorted(recorded) if "output" in recorded[p]]
+            return pd.concat(frames, ignore_index=True) if frames else pd.DataFrame()
+        path = self.path(stage, partition)
+        # A source partition that failed to fetch reads as empty, so dependants can fall back
+        return pd.read_parquet(path) if path.exists() else pd.DataFrame()
+
+    def input_hash(self, stage, partition):
+        parts = [stage.code_hash, partition]
+        for dep in stage.deps:
+            recorded = self.manifest.get(dep, {})
+            keys = sorted(recorded) if self.stages[dep].per_year and partition == ALL else [partition]
+            parts += [dep] + [recorded.get(key, {}).get("output") for key in keys]
+        for name, path in sorted(stage.files.items()):
+            parts += [name, digest(Path(path).read_bytes())]
+        return digest(*parts)
+
+    def stale(self, stage, partition, input_hash):
+        entry = self.manifest.get(stage.name, {}).get(partition)
+        if entry is None:
+            return True
+        if (stage.name, partition) in self.refresh or entry["input"] != input_hash:
+            return True
+        if "error" in entry:
+            return time.time() >= entry["retry_at"]
+        return not self.path(stage, partition).exists()
+
+    def compute(self, stage, partition):
+        entry = self.manifest.get(stage.name, {}).get(partition)
+        if stage.bootstrap and self.use_bootstrap and (entry is None or "output" not in entry):
+            if callable(stage.bootstrap):
+                return stage.bootstrap(int(partition))
+            df = pd.read_csv(DATA_DIR / stage.bootstrap)
+            df = df[df["year"] == int(partition)].reset_index(drop=True)
+            if len(df):
+                return df
+        if stage.source and not stage.deps:
+            return stage.compute(int(partition))
+        inputs = {dep: self.load(dep, partition) for dep in stage.deps}
+        inputs.update({name: pd.read_csv(path) for name, path in stage.files.items()})
+        return stage.compute(**inputs)
+
+    def run_partition(self, stage, partition, input_hash):
+        start = time.perf_counter()
+        try:
+            df = self.compute(stage, partition)
+        except Exception as e:
+            previous = self.manifest.get(stage.name, {}).get(partition)
+            if previous is not None and "output" in previous:
+                # A failed refresh keeps the last good output
+                return partition, previous, time.perf_counter() - start
+            entry = {"input": input_hash, "error": f"{type(e).__name__}: {e}", "retry_at": time.time() + RETRY_SECONDS}
+            return partition, entry, time.perf_counter() - start
+        path = self.path(stage, partition)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        df.to_parquet(path, index=False)
+        entry = {"input": input_hash, "output": frame_hash(df), "rows": len(df)}
+        return partition, entry, time.perf_counter() - start
+
+    def save_manifest(self):
+        self.out.mkdir(parents=True, exist_ok=True)
+        tmp = self.manifest_path.with_suffix(".tmp")
+        tmp.write_text(json.dumps(self.manifest, indent=2, sort_keys=True))
+        tmp.replace(self.manifest_path)
+
+    def run(self, years):
+        for stage in STAGES:
+            partitions = [str(year) for year in years] if stage.per_year else [ALL]
+            hashes = {p: self.input_hash(stage, p) for p in partitions}
+            todo = [p for p in partitions if self.stale(stage, p, hashes[p])]
+            if not todo:
+                print(f"{stage.name}: up to date ({len(partitions)} partitions)")
+                continue
+
+            workers = min(self.workers, stage.max_workers or self.workers, len(todo))
+            changed = failed = 0
+            with ThreadPoolExecutor(max_workers=workers) as pool:
+                for partition, entry, elapsed in pool.map(lambda p: self.run_partition(stage, p, hashes[p]), todo):
+                    previous = self.manifest.get(stage.name, {}).get(partition) or {}
+                    self.manifest.setdefault(stage.name, {})[partition] = entry
+                    if "error" in entry:
+                        failed += 1
+                        print(f"{stage.name}[{partition}]: failed in {elapsed:.2f}s, retrying after "
+                              f"{time.strftime('%Y-%m-%d %H:%M', time.localtime(entry['retry_at']))}: {entry['error']}")
+                        continue
+                    changed += previous.get("output") != entry["output"]
+                    print(f"{stage.name}[{partition}]: {entry['rows']} rows in {elapsed:.2f}s")
+            self.save_manifest()
+            print(f"{stage.name}: recomputed {len(todo)}/{len(partitions)} partitions, {changed} changed output, {failed} failed")
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--years", type=int, nargs="+", help="Seasons to build in addition to those already in the manifest")
+    parser.add_argument("--out", type=Path, default=DEFAULT_OUT)
+    parser.add_argument("--workers", type=int, default=8, help="Partitions computed in parallel per stage")
+    parser.add_argument("--bootstrap", action="store_true", help="Fill missing source partitions from the existing CSVs")
+    parser.add_argument("--refresh", nargs="+", default=[], choices=[s.name for s in STAGES if s.source],
+                        help="Source stages to re-fetch for the selected years")
+    args = parser.parse_args()
+
+    if args.refresh and not args.years:
+        parser.error("--refresh needs --years")
+
+    refresh = {(stage, str(year)) for stage in args.refresh for year in args.years or ()}
+    pipeline = Pipeline(args.out, args.workers, args.bootstrap, refresh)
+    known = {int(p) for p in pipeline.manifest.get("seeds", {})}
+    years = sorted(known | set(args.years or ([] if known else DEFAULT_YEARS)))
+
+    start = time.perf_counter()
+    pipeline.run(years)
+    print(f"Done in {time.perf_counter() - start:.1f}s")
+
+if __name__ == "__main__":
+    main()
@@ -7,25 +7,34 @@ from unidecode import unidecode
 import random
 import requests
 
+# Normalize team names to fix inconsistencies
+def clean_team_name(name):
+    """Standardizes team names for better matching"""
+    if pd.isna(name):
+        return ""
+    name = name.lower().strip()  # Lowercase and trim spaces
+    name = re.sub(r"\s*\(.*?\)", "", name)  # Remove text inside parentheses
+    name = re.sub(r"[^\w\s-]", "", name)  # Remove special characters except hyphens
+    name = name.replace("st ", "saint ")  # Standardize abbreviations
+    return name
+
 # Load dataset
 def make_matchups_table():
     file_path = "march_madness_2023.csv"
     df = pd.read_csv(file_path)
 
+    matchups_df = build_matchups(df)
+
+    # Save the processed dataset
+    output_file = "march_madness_matchups.csv"
+    matchups_df.to_csv(output_file, index=False)
+    print(f"Matchup dataset saved to {output_file}")
+
+def build_matchups(df):
+    """Pairs each team with the opponents it beat; works on one season or many."""
     # Drop unnecessary columns
     df = df.drop(columns=["conference", "ncaa_loss"], errors="ignore")
 
-    # Normalize team names to fix inconsistencies
-    def clean_team_name(name):
-        """Standardizes team names for better matching"""
-        if pd.isna(name):
-            return ""
-        name = name.lower().strip()  # Lowercase and trim spaces
-        name = re.sub(r"\s*\(.*?\)", "", name)  # Remove text inside parentheses
-        name = re.sub(r"[^\w\s-]", "", name)  # Remove special characters except hyphens
-        name = name.replace("st ", "saint ")  # Standardize abbreviations
-        return name
-
     # Apply name cleaning
     df["team"] = df["team"].apply(clean_team_name)
 
@@ -84,12 +93,189 @@ def make_matchups_table():
             matchups.append(matchup_data)
 
     # Convert to DataFrame
-    matchups_df = pd.DataFrame(matchups)
+    return pd.DataFrame(matchups)
+
+# Headers to mimic a real browser
+HEADERS = {
+    "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36",
+    "Accept-Language": "en-US,en;q=0.9",
+    "Referer": "https://www.google.com/",
+    "Connection": "keep-alive"
+}
+
+# Normalize team names for Sports-Reference URLs
+def format_team_name(team):
+    team = unidecode(team.lower())  # Convert to lowercase and remove accents
+    team = team.replace(" ", "-").replace("&", "and")  # Format for URL
+    return team
+
+# Function to safely convert table values to float (handling empty values)
+def safe_float(value):
+    try:
+        return float(value) if value.strip() else None  # Convert if non-empty, else None
+    except ValueError:
+        return None  # Handle non-numeric cases
+
+def extract_ncaa_results(summary_div):
+    """
+    Extracts all NCAA Tournament wins and losses correctly, ensuring that the last game is always a loss.
+    """
+    wins = []
+    losses = []
+
+    # Locate the NCAA Tournament paragraph
+    ncaa_p = None
+    for p in summary_div.find_all("p"):
+        if "NCAA Tournament" in p.text:
+            ncaa_p = p
+            break
+
+    if not ncaa_p:
+        return None, None  # No NCAA data found
+
+    # Extract all lines within the paragraph
+    lines = ncaa_p.decode_contents().split("<br>")
+
+    for line in lines:
+        # Use BeautifulSoup to parse HTML content within the line
+        line_soup = BeautifulSoup(line, "html.parser")
+        text = line_soup.get_text(" ", strip=True)  # Extract text, preserving spacing
+
+        # Find all opponent links inside the line
+        team_links = line_soup.find_all("a", href=re.compile("/cbb/schools/"))
+
+        for team_link in team_links:
+            opponent = team_link.text.strip()
+            opponent = re.sub(r"#\d+\s+", "", opponent)  # Remove any seed numbers
+
+            if "Won" in text and "versus" in text:
+                wins.append(opponent)
+            elif "Lost" in text and "versus" in text:
+                losses.append(opponent)
+
+    # Ensure the last team is recorded as a loss if applicable
+    if len(wins) == 6:
+        return ", ".join(wins), None
+    elif wins and not losses:
+        # Move the last win into the loss column
+        losses.append(wins.pop())
+
+    return ", ".join(wins) if wins else None, ", ".join(losses) if losses else None
+
+# Function to scrape per-game and advanced stats from Sports-Reference
+def scrape_team_stats(team, year, team_mapping, session):
+    formatted_team = team_mapping.get(team, format_team_name(team))
+    url = f"https://www.sports-reference.com/cbb/schools/{formatted_team}/men/{year}.html"
+
+    retries = 3  # Number of retry attempts for 429 errors
+    wait_time = 10  # Initial wait time for rate limiting
+
+    while retries > 0:
+        try:
+            response = session.get(url, timeout=10)  # Timeout prevents hanging requests
+
+            # Handle rate limiting (429) with exponential backoff
+            if response.status_code == 429:
+                print(f"Rate Limited (429): Waiting {wait_time}s before retrying...")
+                time.sleep(wait_time)
+                wait_time *= 2  # Exponential backoff
+                retries -= 1
+                continue  # Retry the request
+
+            # Handle missing pages (404 errors)
+            if response.status_code == 404:
+                print(f"Page not found: {team} ({year}) - {url}")
+                return None
 
-    # Save the processed dataset
-    output_file = "march_madness_matchups.csv"
-    matchups_df.to_csv(output_file, index=False)
-    print(f"Matchup dataset saved to {output_file}")
+            # Handle unexpected errors
+            if response.status_code != 200:
+                print(f"Failed to retrieve stats for {team} ({year}) - {url}")
+                with open("error_log.txt", "a") as log_file:
+                    log_file.write(f"{team}, {year}, {url}, HTTP {response.status_code}\n")
+                return None
+
+            soup = BeautifulSoup(response.text, "html.parser")
+
+            # Locate the per-game stats table
+            table_div = soup.find("div", id="all_per_game_team")
+            if not table_div:
+                print(f"No per-game stats found for {team} ({year}) - {url}")
+                return None
+
+            # Find the "Per Game Team and Opponent Stats" table
+            stats_table = table_div.find("table", id="season-total_per_game")
+            if not stats_table:
+                print(f"Stats table missing for {team} ({year}) - {url}")
+                return None
+
+            # Extract table rows
+            rows = stats_table.find_all("tr")
+            stats = {"team": team, "year": year}
+
+            for row in rows:
+                cols = row.find_all("td")
+                if not cols:
+                    continue
+                summary_div = soup.find("div", {"data-template": "Partials/Teams/Summary"})
+                if summary_div:
+                    ncaa_wins, ncaa_losses = extract_ncaa_results(summary_div)
+                    stats["ncaa_wins"] = ncaa_wins
+                    stats["ncaa_loss"] = ncaa_losses
+                    for p in summary_div.find_all("p"):
+                        text = p.get_text(strip=True)
+                        if "PS/G:" in text:
+                            stats["ps_per_game"] = safe_float(text.split("PS/G:")[-1].split(" ")[0])
+                        elif "PA/G:" in text:
+                            stats["pa_per_game"] = safe_float(text.split("PA/G:")[-1].split(" ")[0])
+                        elif "SRS:" in text:
+                            stats["srs"] = safe_float(text.split("SRS:")[-1].split(" ")[0])
+                        elif "SOS:" in text:
+                            stats["sos"] = safe_float(text.split("SOS:")[-1].split(" ")[0])
+                        elif "ORtg:" in text:
+                            stats["offensive_rating"] = safe_float(text.split("ORtg:")[-1].split(" ")[0])
+                        elif "DRtg:" in text:
+                            stats["defensive_rating"] = safe_float(text.split("DRtg:")[-1].split(" ")[0])
+
+                # Identify the row labeled "Team" (ignoring "Opponent" and "Rank")
+                label = row.find("th").text.strip()
+                if label.lower() == "team":
+                    stats["fg_per_game"] = safe_float(cols[2].text)
+                    stats["fga_per_game"] = safe_float(cols[3].text)
+                    stats["fg_pct"] = safe_float(cols[4].text)
+                    stats["fg2_per_game"] = safe_float(cols[5].text)
+                    stats["fg2a_per_game"] = safe_float(cols[6].text)
+                    stats["fg2_pct"] = safe_float(cols[7].text)
+                    stats["fg3_per_game"] = safe_float(cols[8].text)
+                    stats["fg3a_per_game"] = safe_float(cols[9].text)
+                    stats["fg3_pct"] = safe_float(cols[10].text)
+                    stats["ft_per_game"] = safe_float(cols[11].text)
+                    stats["fta_per_game"] = safe_float(cols[12].text)
+                    stats["ft_pct"] = safe_float(cols[13].text)
+                    stats["orb_per_game"] = safe_float(cols[14].text)
+                    stats["drb_per_game"] = safe_float(cols[15].text)
+                    stats["trb_per_game"] = safe_float(cols[16].text)
+                    stats["ast_per_game"] = safe_float(cols[17].text)
+                    stats["stl_per_game"] = safe_float(cols[18].text)
+                    stats["blk_per_game"] = safe_float(cols[19].text)
+                    stats["tov_per_game"] = safe_float(cols[20].text)
+                    stats["pf_per_game"] = safe_float(cols[21].text)
+                    break  
+
+            return stats
+
+        except requests.exceptions.RequestException as e:
+            print(f"Request failed for {team} ({year}) - {url}: {str(e)}")
+            with open("error_log.txt", "a") as log_file:
+                log_file.write(f"{team}, {year}, {url}, Error: {str(e)}\n")
+            return None
+
+    return None
+
+def make_session():
+    """A requests session with browser-like headers, reused across Sports-Reference pages."""
+    session = requests.Session()
+    session.headers.update(HEADERS)
+    return session
 
 # Load the dataset
 def scrape_sports_reference():
@@ -100,185 +286,8 @@ def scrape_sports_reference():
     mapping_df = pd.read_csv("mapped_ncaa_teams.csv")  # Contains unique_ncaa_team → lower_ncaa_team
     team_mapping = dict(zip(mapping_df["unique_ncaa_team"], mapping_df["lower_ncaa_team"]))
 
-    # Headers to mimic a real browser
-    HEADERS = {
-        "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36",
-        "Accept-Language": "en-US,en;q=0.9",
-        "Referer": "https://www.google.com/",
-        "Connection": "keep-alive"
-    }
-
     # Use a session for efficiency
-    session = requests.Session()
-    session.headers.update(HEADERS)
-
-    # Normalize team names for Sports-Reference URLs
-    def format_team_name(team):
-        team = unidecode(team.lower())  # Convert to lowercase and remove accents
-        team = team.replace(" ", "-").replace("&", "and")  # Format for URL
-        return team
-
-    # Function to safely convert table values to float (handling empty values)
-    def safe_float(value):
-        try:
-            return float(value) if value.strip() else None  # Convert if non-empty, else None
-        except ValueError:
-            return None  # Handle non-numeric cases
-        
-    def extract_ncaa_results(summary_div):
-        """
-        Extracts all NCAA Tournament wins and losses correctly, ensuring that the last game is always a loss.
-        """
-        wins = []
-        losses = []
-
-        # Locate the NCAA Tournament paragraph
-        ncaa_p = None
-        for p in summary_div.find_all("p"):
-            if "NCAA Tournament" in p.text:
-                ncaa_p = p
-                break
-        
-        if not ncaa_p:
-            return None, None  # No NCAA data found
-
-        # Extract all lines within the paragraph
-        lines = ncaa_p.decode_contents().split("<br>")
-
-        for line in lines:
-            # Use BeautifulSoup to parse HTML content within the line
-            line_soup = BeautifulSoup(line, "html.parser")
-            text = line_soup.get_text(" ", strip=True)  # Extract text, preserving spacing
-
-            # Find all opponent links inside the line
-            team_links = line_soup.find_all("a", href=re.compile("/cbb/schools/"))
-
-            for team_link in team_links:
-                opponent = team_link.text.strip()
-                opponent = re.sub(r"#\d+\s+", "", opponent)  # Remove any seed numbers
-
-                if "Won" in text and "versus" in text:
-                    wins.append(opponent)
-                elif "Lost" in text and "versus" in text:
-                    losses.append(opponent)
-
-        # Ensure the last team is recorded as a loss if applicable
-        if len(wins) == 6:
-            return ", ".join(wins), None
-        elif wins and not losses:
-            # Move the last win into the loss column
-            losses.append(wins.pop())
-
-        return ", ".join(wins) if wins else None, ", ".join(losses) if losses else None
-
-    # Function to scrape per-game and advanced stats from Sports-Reference
-    def scrape_team_stats(team, year):
-        formatted_team = team_mapping.get(team, format_team_name(team))
-        url = f"https://www.sports-reference.com/cbb/schools/{formatted_team}/men/{year}.html"
-
-        retries = 3  # Number of retry attempts for 429 errors
-        wait_time = 10  # Initial wait time for rate limiting
-
-        while retries > 0:
-            try:
-                response = session.get(url, timeout=10)  # Timeout prevents hanging requests
-
-                # Handle rate limiting (429) with exponential backoff
-                if response.status_code == 429:
-                    print(f"Rate Limited (429): Waiting {wait_time}s before retrying...")
-                    time.sleep(wait_time)
-                    wait_time *= 2  # Exponential backoff
-                    retries -= 1
-                    continue  # Retry the request
-
-                # Handle missing pages (404 errors)
-                if response.status_code == 404:
-                    print(f"Page not found: {team} ({year}) - {url}")
-                    return None
-
-                # Handle unexpected errors
-                if response.status_code != 200:
-                    print(f"Failed to retrieve stats for {team} ({year}) - {url}")
-                    with open("error_log.txt", "a") as log_file:
-                        log_file.write(f"{team}, {year}, {url}, HTTP {response.status_code}\n")
-                    return None
-
-                soup = BeautifulSoup(response.text, "html.parser")
-
-                # Locate the per-game stats table
-                table_div = soup.find("div", id="all_per_game_team")
-                if not table_div:
-                    print(f"No per-game stats found for {team} ({year}) - {url}")
-                    return None
-
-                # Find the "Per Game Team and Opponent Stats" table
-                stats_table = table_div.find("table", id="season-total_per_game")
-                if not stats_table:
-                    print(f"Stats table missing for {team} ({year}) - {url}")
-                    return None
-
-                # Extract table rows
-                rows = stats_table.find_all("tr")
-                stats = {"team": team, "year": year}
-
-                for row in rows:
-                    cols = row.find_all("td")
-                    if not cols:
-                        continue
-                    summary_div = soup.find("div", {"data-template": "Partials/Teams/Summary"})
-                    if summary_div:
-                        ncaa_wins, ncaa_losses = extract_ncaa_results(summary_div)
-                        stats["ncaa_wins"] = ncaa_wins
-                        stats["ncaa_loss"] = ncaa_losses
-                        for p in summary_div.find_all("p"):
-                            text = p.get_text(strip=True)
-                            if "PS/G:" in text:
-                                stats["ps_per_game"] = safe_float(text.split("PS/G:")[-1].split(" ")[0])
-                            elif "PA/G:" in text:
-                                stats["pa_per_game"] = safe_float(text.split("PA/G:")[-1].split(" ")[0])
-                            elif "SRS:" in text:
-                                stats["srs"] = safe_float(text.split("SRS:")[-1].split(" ")[0])
-                            elif "SOS:" in text:
-                                stats["sos"] = safe_float(text.split("SOS:")[-1].split(" ")[0])
-                            elif "ORtg:" in text:
-                                stats["offensive_rating"] = safe_float(text.split("ORtg:")[-1].split(" ")[0])
-                            elif "DRtg:" in text:
-                                stats["defensive_rating"] = safe_float(text.split("DRtg:")[-1].split(" ")[0])
-                            
-                    # Identify the row labeled "Team" (ignoring "Opponent" and "Rank")
-                    label = row.find("th").text.strip()
-                    if label.lower() == "team":
-                        stats["fg_per_game"] = safe_float(cols[2].text)
-                        stats["fga_per_game"] = safe_float(cols[3].text)
-                        stats["fg_pct"] = safe_float(cols[4].text)
-                        stats["fg2_per_game"] = safe_float(cols[5].text)
-                        stats["fg2a_per_game"] = safe_float(cols[6].text)
-                        stats["fg2_pct"] = safe_float(cols[7].text)
-                        stats["fg3_per_game"] = safe_float(cols[8].text)
-                        stats["fg3a_per_game"] = safe_float(cols[9].text)
-                        stats["fg3_pct"] = safe_float(cols[10].text)
-                        stats["ft_per_game"] = safe_float(cols[11].text)
-                        stats["fta_per_game"] = safe_float(cols[12].text)
-                        stats["ft_pct"] = safe_float(cols[13].text)
-                        stats["orb_per_game"] = safe_float(cols[14].text)
-                        stats["drb_per_game"] = safe_float(cols[15].text)
-                        stats["trb_per_game"] = safe_float(cols[16].text)
-                        stats["ast_per_game"] = safe_float(cols[17].text)
-                        stats["stl_per_game"] = safe_float(cols[18].text)
-                        stats["blk_per_game"] = safe_float(cols[19].text)
-                        stats["tov_per_game"] = safe_float(cols[20].text)
-                        stats["pf_per_game"] = safe_float(cols[21].text)
-                        break  
-
-                return stats
-
-            except requests.exceptions.RequestException as e:
-                print(f"Request failed for {team} ({year}) - {url}: {str(e)}")
-                with open("error_log.txt", "a") as log_file:
-                    log_file.write(f"{team}, {year}, {url}, Error: {str(e)}\n")
-                return None
-
-        return None
+    session = make_session()
 
     # **Process all teams**
     all_stats = []
@@ -287,7 +296,7 @@ def scrape_sports_reference():
         year = row["year"]
 
         print(f"\nFetching stats for {team} ({year})...")
-        stats = scrape_team_stats(team, year)
+        stats = scrape_team_stats(team, year, team_mapping, session)
 
         if stats:
             all_stats.append(stats)
@@ -308,67 +317,73 @@ def scrape_sports_reference():
     print(f"\nFinal data saved to march_madness_with_full_stats.csv")
 
 
-def scrape_wikipedia():
-    # Define years to scrape
-    years = range(1991, 2025)  # 1991 to 2024
+def scrape_wikipedia_year(year, session=None):
+    """Seeded teams (seed, team, conference, record) from one tournament's Wikipedia page."""
+    url = f"https://en.wikipedia.org/wiki/{year}_NCAA_Division_I_men%27s_basketball_tournament"
+    response = (session or requests).get(url, timeout=10)  # Timeout prevents hanging requests
 
-    all_teams = []
+    if response.status_code != 200:
+        print(f"Failed to retrieve data for {year}")
+        return []
 
-    for year in years:
-        url = f"https://en.wikipedia.org/wiki/{year}_NCAA_Division_I_men%27s_basketball_tournament"
-        response = requests.get(url)
+    soup = BeautifulSoup(response.text, "html.parser")
 
-        if response.status_code != 200:
-            print(f"Failed to retrieve data for {year}")
-            continue
+    # Find tables that likely contain team information
+    tables = soup.find_all("table", {"class": "wikitable"})
 
-        soup = BeautifulSoup(response.text, "html.parser")
-        
-        # Find tables that likely contain team information
-        tables = soup.find_all("table", {"class": "wikitable"})
+    teams_data = []
 
-        teams_data = []
+    for table in tables:
+        rows = table.find_all("tr")[1:]  # Skip header row
 
-        for table in tables:
-            rows = table.find_all("tr")[1:]  # Skip header row
+        for row in rows:
+            cells = row.find_all(["th", "td"])  # Include both headers and data
+            if len(cells) >= 4:
+                try:
+                    # Extract seed and clean it
+                    seed_text = cells[0].text.strip().replace("#", "").replace("*", "")
+                    if not seed_text or not seed_text[0].isdigit():
+                        continue  # Skip rows without a valid seed
 
-            for row in rows:
-                cells = row.find_all(["th", "td"])  # Include both headers and data
-                if len(cells) >= 4:
-                    try:
-                        # Extract seed and clean it
-                        seed_text = cells[0].text.strip().replace("#", "").replace("*", "")
-                        if not seed_text or not seed_text[0].isdigit():
-                            continue  # Skip rows without a valid seed
-
-                        seed = int(seed_text)
-                        if seed > 16:
-                            continue
-
-                        # Clean the team name by removing anything after "(vacated)"
-                        team = re.sub(r"\(vacated.*$", "", cells[1].text.strip()).strip()
-
-                        conference = cells[2].text.strip()
-
-                        # Extract record (wins and losses)
-                        record_text = cells[3].text.strip().replace("\n", "").replace("–", "-")
-                        if "–" in record_text:
-                            wins, losses = map(int, record_text.split("–"))
-                        elif "-" in record_text:
-                            wins, losses = map(int, record_text.split("-"))
-                        else:
-                            continue  # Skip if record is missing
-
-                        teams_data.append({
-                            "seed": seed,
-                            "team": team,
-                            "conference": conference,
-                            "wins": wins,
-                            "losses": losses,
-                            "year": year
-                        })
-                    except (ValueError, IndexError):
-                        continue  # Skip rows that don’t match expected format
+                    seed = int(seed_text)
+                    if seed > 16:
+                        continue
+
+                    # Clean the team name by removing anything after "(vacated)"
+                    team = re.sub(r"\(vacated.*$", "", cells[1].text.strip()).strip()
+
+                    conference = cells[2].text.strip()
+
+                    # Extract record (wins and losses)
+                    record_text = cells[3].text.strip().replace("\n", "").replace("–", "-")
+                    if "–" in record_text:
+                        wins, losses = map(int, record_text.split("–"))
+                    elif "-" in record_text:
+                        wins, losses = map(int, record_text.split("-"))
+                    else:
+                        continue  # Skip if record is missing
+
+                    teams_data.append({
+                        "seed": seed,
+                        "team": team,
+                        "conference": conference,
+                        "wins": wins,
+                        "losses": losses,
+                        "year": year
+                    })
+                except (ValueError, IndexError):
+                    continue  # Skip rows that don’t match expected format
+
+    return teams_data
+
+def scrape_wikipedia():
+    # Define years to scrape
+    years = range(1991, 2025)  # 1991 to 2024
+
+    all_teams = []
+
+    for year in years:
+        teams_data = scrape_wikipedia_year(year)
 
         if teams_data:
             all_teams.extend(teams_data)
@@ -404,6 +419,15 @@ def merge_dfs():
     cleaned_df = pd.read_csv("march_madness_1991_2024_cleaned.csv")
     sports_ref_df = pd.read_csv("march_madness_sports_reference.csv")
 
+    merged_df = merge_team_stats(cleaned_df, sports_ref_df)
+
+    # Save the merged file
+    merged_df.to_csv("march_madness_merged.csv", index=False)
+
+    print("Merging complete! 'conference' column removed, and saved as 'march_madness_merged.csv'.")
+
+def merge_team_stats(cleaned_df, sports_ref_df):
+    """Joins seeds and records with Sports-Reference stats and orders the columns."""
     # Merge on 'team' and 'year'
     merged_df = cleaned_df.merge(sports_ref_df, on=["team", "year"], how="left")
 
@@ -427,12 +451,7 @@ def merge_dfs():
 
     # Ensure all required columns exist, ignoring missing ones
     existing_columns = [col for col in column_order if col in merged_df.columns]
-    merged_df = merged_df[existing_columns]
-
-    # Save the merged file
-    merged_df.to_csv("march_madness_merged.csv", index=False)
-
-    print("Merging complete! 'conference' column removed, and saved as 'march_madness_merged.csv'.")
+    return merged_df[existing_columns]
 
 def map_team_name():
     # Load the CSV files
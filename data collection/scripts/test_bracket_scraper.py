@@ -0,0 +1,80 @@
+'''
+Offline tests for bracket_scraper, against the saved pages in fixtures/.
+
+    python -m pytest "data collection/scripts/test_bracket_scraper.py"
+'''
+
+from pathlib import Path
+import pandas as pd
+import pytest
+import bracket_scraper
+from scrape_tools import clean_team_name
+
+FIXTURES = Path(__file__).resolve().parent / "fixtures"
+
+
+@pytest.fixture(scope="module")
+def games():
+    return bracket_scraper.scrape_year(2024, None, FIXTURES, offline=True)
+
+
+def test_parse_score():
+    assert bracket_scraper.parse_score("'''77'''<sup>OT</sup>") == (77, 1)
+    assert bracket_scraper.parse_score("80 2OT") == (80, 2)
+    assert bracket_scraper.parse_score("'''91'''") == (91, 0)
+    assert bracket_scraper.parse_score("") == (None, 0)
+
+
+def test_parse_seed_and_team():
+    assert bracket_scraper.parse_seed("16") == 16
+    assert bracket_scraper.parse_seed("MW1") == 1
+    assert bracket_scraper.parse_seed("") is None
+    assert bracket_scraper.parse_team("'''{{nowrap|[[2023–24 UConn Huskies men's basketball team|UConn]]}}'''") == "UConn"
+    assert bracket_scraper.parse_team("[[Illinois Fighting Illini men's basketball|Illinois]]<ref>note</ref>") == "Illinois"
+
+
+def test_split_params_ignores_nested_pipes():
+    params = bracket_scraper.split_params("16TeamBracket\n| RD1-team01=[[A|B]]\n| RD1-score01={{nowrap|1|2}}\n| RD1-seed01=1")
+    assert params == {"RD1-team01": "[[A|B]]", "RD1-score01": "{{nowrap|1|2}}", "RD1-seed01": "1"}
+
+
+def test_region_name():
+    assert bracket_scraper.region_name("East Regional – Boston, Massachusetts") == "East"
+    assert bracket_scraper.region_name("Midwest regional") == "Midwest"
+
+
+def test_rounds_and_regions(games):
+    # 15 East regional games and 3 national games; the First Four bracket is skipped
+    assert len(games) == 18
+    assert games["round"].value_counts().sort_index().to_dict() == {1: 8, 2: 4, 3: 2, 4: 1, 5: 2, 6: 1}
+    assert set(games.loc[games["round"] <= 4, "region"]) == {"East"}
+    assert games.loc[games["round"] >= 5, "region"].isna().all()
+    assert "Grambling State" not in set(games["teamA"]) | set(games["teamB"])
+
+
+def test_game_fields(games):
+    overtime = games[games["teamB"] == "Northwestern"].iloc[0]
+    assert (overtime["seed_teamA"], overtime["score_teamA"], overtime["score_teamB"]) == (8, 65, 77)
+    assert (overtime["overtimes"], overtime["winner"]) == (1, 0)
+
+    final = games[games["round"] == 6].iloc[0]
+    assert (final["teamA"], final["seed_teamA"], final["teamB"], final["seed_teamB"]) == ("UConn", 1, "Purdue", 1)
+    assert final["winner"] == 1
+
+    assert games[["seed_teamA", "score_teamA", "winner"]].dtypes.eq("Int64").all()
+
+
+def test_offline_missing_page_does_not_fetch():
+    with pytest.raises(FileNotFoundError):
+        bracket_scraper.fetch_page(1991, None, FIXTURES, offline=True)
+
+
+def test_games_to_matchups_exact_join(games):
+    teams = ["UConn", "Stetson", "Purdue"]
+    team_stats = pd.DataFrame({"year": 2024, "team": teams, "conference": "x", "seed": [1, 16, 1], "srs": [25.0, -5.0, 24.0]})
+    matchups = bracket_scraper.games_to_matchups(games, team_stats, clean_team_name)
+
+    # Only games with stats for both teams survive
+    assert matchups[["teamA", "teamB", "winner"]].values.tolist() == [["uconn", "stetson", 1], ["uconn", "purdue", 1]]
+    assert matchups["diff_seed"].tolist() == [-15.0, 0.0]
+    assert matchups["diff_srs"].tolist() == [30.0, 1.0]